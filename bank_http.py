@@ -3,6 +3,8 @@
 from urllib.parse import urlencode, urlsplit, urlunsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 _TRANSLATE_QUERY = {
@@ -18,6 +20,37 @@ _BLOCK_PAGE_MARKERS = (
 )
 
 
+# Longest Retry-After we will sleep for on a 503 before retrying
+_RETRY_AFTER_CAP = 5
+
+
+class _CappedRetry(Retry):
+    """Retry that honours Retry-After, but never waits longer than the cap."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, _RETRY_AFTER_CAP)
+
+
+def _build_session():
+    # Gateway errors are usually transient, so back off and retry them before giving up.
+    # 429 is left out: get_bank_response treats it as a block and goes to the proxy at once
+    retry = _CappedRetry(
+        total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every scraper so repeat requests to a bank reuse its TLS connection
+SESSION = _build_session()
+
+
 def google_translate_url(url):
     """Return Google's website-translation URL for a public HTTPS page."""
     parsed = urlsplit(url)
@@ -51,7 +84,7 @@ def get_bank_response(url, headers, logger, bank_name, timeout=20):
     direct_error = None
 
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = SESSION.get(url, headers=headers, timeout=timeout)
         if not _is_block_page(response):
             response.raise_for_status()
             return response, False
@@ -66,7 +99,7 @@ def get_bank_response(url, headers, logger, bank_name, timeout=20):
         "retrying through the Google Translate web proxy"
     )
 
-    response = requests.get(fallback_url, headers=headers, timeout=timeout)
+    response = SESSION.get(fallback_url, headers=headers, timeout=timeout)
     response.raise_for_status()
     if _is_block_page(response):
         raise requests.HTTPError(
@@ -6,26 +6,36 @@ Scrapes GBP exchange rates directly from each bank's website
 Optimized for automated execution in GitHub Actions with enhanced logging and error handling
 """
 
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from urllib3.util.request import ACCEPT_ENCODING
+from bs4 import BeautifulSoup, SoupStrainer
+import lxml.etree
+import lxml.html
 import re
 from datetime import datetime
-import time
 from pymongo import MongoClient, ASCENDING
 from pymongo.errors import ConnectionFailure
+from pymongo.write_concern import WriteConcern
 import os
 import sys
+import traceback
 import logging
+import logging.handlers
+import queue
+import threading
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 from pathlib import Path
 from dotenv import load_dotenv
 import json
-from bank_http import get_bank_response
+from bank_http import SESSION, get_bank_response
 
 # Selenium imports
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
@@ -33,43 +43,106 @@ try:
 except ImportError:
     pass
 
+# Faster JSON serialization when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Load environment variables
 load_dotenv()
 
+# Runner details are fixed for the life of the process, so read them once
+GITHUB_ACTIONS = bool(os.getenv('GITHUB_ACTIONS'))
+WORKFLOW_RUN_ID = os.getenv('GITHUB_RUN_ID')
+RUNNER_OS = os.getenv('RUNNER_OS', 'unknown')
+TIMEZONE = os.getenv('TZ', 'UTC')
+# Opt-in: end with os._exit after explicit cleanup, skipping atexit hooks
+FAST_EXIT = os.getenv('FAST_EXIT') == '1'
+# Reruns reuse today's document if every bank in it was scraped within this many seconds; FORCE_SCRAPE=1 always scrapes
+FORCE_SCRAPE = os.getenv('FORCE_SCRAPE') == '1'
+FRESH_DOCUMENT_SECONDS = 600
+# scrape_events rows are diagnostics only; MongoDB drops them after this long
+SCRAPE_EVENT_TTL_SECONDS = 30 * 24 * 60 * 60
+
 CURRENCY = 'GBP'
 CURRENCY_NAMES = ['GBP', 'Pound Sterling', 'POUND STERLING', 'British Pound', 'Sterling Pound']
+# HNB quotes each currency's rate pair shortly after its code or name
+HNB_ANCHORS = 'GBP|Pound|Sterling'
+HNB_ANCHOR_PATTERN = re.compile(HNB_ANCHORS, re.IGNORECASE)
 
-# Common headers for requests
+# Common headers for requests; ACCEPT_ENCODING adds br when brotli is installed
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Encoding': ACCEPT_ENCODING,
     'Connection': 'keep-alive',
     'Upgrade-Insecure-Requests': '1',
 }
 
+# Decimal rate values such as 195.45 in table cells and text
+RATE_PATTERN = re.compile(r'\d+\.\d+')
+
+# HNB rate-sized numbers, only searched within a short window after each anchor
+HNB_RATE_NUMBER_PATTERN = re.compile(r'\d{2,3}\.\d{1,4}')
+HNB_RATE_WINDOW = 500
+# EXSLT regex namespace, so the static lookup can match HNB_ANCHORS inside lxml XPath
+HNB_EXSLT_REGEX_NS = 'http://exslt.org/regular-expressions'
+
+# Runs in the browser: return only the text following each anchor instead of the whole DOM.
+# textContent (not innerText) so rates on hidden carousel slides are included.
+# Every anchor is scanned, but only snippets holding a rate-shaped number are sent back.
+HNB_SNIPPET_SCRIPT = r"""
+var anchor = new RegExp(arguments[0], 'gi');
+var rate = /\d{2,3}\.\d{1,4}/;
+var text = document.body ? document.body.textContent : '';
+var snippets = [];
+var match;
+while ((match = anchor.exec(text)) !== null) {
+    var snippet = text.substr(match.index, match[0].length + arguments[1]);
+    if (rate.test(snippet)) {
+        snippets.push(snippet);
+    }
+}
+return snippets;
+"""
+
 # ============================================================
 # LOGGING & ENVIRONMENT
 # ============================================================
 
+_LOG_LISTENER = None
+
+
 def setup_logging():
     """Setup comprehensive logging for GitHub Actions environment"""
+    global _LOG_LISTENER
+
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = log_dir / f"gbp_exchange_scraper_{timestamp}.log"
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+
+    # Scraper threads only enqueue records; the listener thread does the file and stdout writes
+    log_queue = queue.SimpleQueue()
+    _LOG_LISTENER = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
     )
+    _LOG_LISTENER.start()
+
+    # The listener's handlers apply the real format, so only the message is rendered here
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
     if sys.platform == "win32":
         try:
@@ -80,17 +153,25 @@ def setup_logging():
     logger = logging.getLogger(__name__)
     logger.info(f"🚀 GBP Exchange Rate Scraper Started - Log file: {log_file}")
     logger.info(f"⏰ Execution time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.info(f"🌍 Timezone: {os.getenv('TZ', 'UTC')}")
+    logger.info(f"🌍 Timezone: {TIMEZONE}")
     return logger
 
 
+def stop_logging():
+    """Flush queued log records and stop the listener thread"""
+    global _LOG_LISTENER
+    if _LOG_LISTENER is not None:
+        _LOG_LISTENER.stop()
+        _LOG_LISTENER = None
+
+
 def log_environment_info(logger):
     """Log environment information for debugging"""
     logger.info("🔧 Environment Information:")
     logger.info(f"  Python version: {sys.version}")
     logger.info(f"  Working directory: {os.getcwd()}")
-    logger.info(f"  GitHub Actions: {'Yes' if os.getenv('GITHUB_ACTIONS') else 'No'}")
-    logger.info(f"  Runner OS: {os.getenv('RUNNER_OS', 'Unknown')}")
+    logger.info(f"  GitHub Actions: {'Yes' if GITHUB_ACTIONS else 'No'}")
+    logger.info(f"  Runner OS: {RUNNER_OS}")
     logger.info(f"  MongoDB connection configured: {bool(os.getenv('MONGODB_CONNECTION_STRING'))}")
 
 
@@ -101,37 +182,99 @@ def create_screenshots_dir():
     return screenshots_dir
 
 
+BANK_MAPPINGS = {
+    'central bank of sri lanka': 'Central Bank of Sri Lanka',
+    'amana bank': 'Amana Bank',
+    'bank of ceylon': 'Bank of Ceylon',
+    'boc': 'Bank of Ceylon',
+    'commercial bank': 'Commercial Bank',
+    'hatton national bank': 'Hatton National Bank',
+    'hnb': 'Hatton National Bank',
+    'hsbc bank': 'HSBC Bank',
+    'hsbc': 'HSBC Bank',
+    'nations trust bank': 'Nations Trust Bank',
+    'ntb': 'Nations Trust Bank',
+    "people's bank": "People's Bank",
+    'peoples bank': "People's Bank",
+    'sampath bank': 'Sampath Bank'
+}
+
+# Longest keys first so the most specific partial match wins
+_FUZZY_BANK_MAPPINGS = tuple(sorted(BANK_MAPPINGS.items(), key=lambda item: len(item[0]), reverse=True))
+
+
+@functools.lru_cache(maxsize=256)
 def normalize_bank_name(bank_name):
     """Normalize bank names to consistent, clean format"""
     name_lower = bank_name.lower().strip()
-    bank_mappings = {
-        'central bank of sri lanka': 'Central Bank of Sri Lanka',
-        'amana bank': 'Amana Bank',
-        'bank of ceylon': 'Bank of Ceylon',
-        'boc': 'Bank of Ceylon',
-        'commercial bank': 'Commercial Bank',
-        'hatton national bank': 'Hatton National Bank',
-        'hnb': 'Hatton National Bank',
-        'hsbc bank': 'HSBC Bank',
-        'hsbc': 'HSBC Bank',
-        'nations trust bank': 'Nations Trust Bank',
-        'ntb': 'Nations Trust Bank',
-        "people's bank": "People's Bank",
-        'peoples bank': "People's Bank",
-        'sampath bank': 'Sampath Bank'
-    }
-    if name_lower in bank_mappings:
-        return bank_mappings[name_lower]
-    for key, value in bank_mappings.items():
+    exact = BANK_MAPPINGS.get(name_lower)
+    if exact:
+        return exact
+    for key, value in _FUZZY_BANK_MAPPINGS:
         if key in name_lower or name_lower in key:
             return value
     return bank_name.title()
 
 
+def compute_market_statistics(bank_data_list):
+    """Compute min/max/avg and best bank for both sides of the market in one pass"""
+    first = bank_data_list[0]
+    buy_min = buy_max = buy_sum = first['buying_rate']
+    sell_min = sell_max = sell_sum = first['selling_rate']
+    buy_best_bank = sell_best_bank = first['bank']
+
+    for bank_info in bank_data_list[1:]:
+        buying_rate = bank_info['buying_rate']
+        selling_rate = bank_info['selling_rate']
+        buy_sum += buying_rate
+        sell_sum += selling_rate
+        if buying_rate < buy_min:
+            buy_min = buying_rate
+        if buying_rate > buy_max:
+            buy_max = buying_rate
+            buy_best_bank = bank_info['bank']
+        if selling_rate < sell_min:
+            sell_min = selling_rate
+            sell_best_bank = bank_info['bank']
+        if selling_rate > sell_max:
+            sell_max = selling_rate
+
+    count = len(bank_data_list)
+    return {
+        'people_selling': {
+            'min': buy_min,
+            'max': buy_max,
+            'avg': buy_sum / count,
+            'best_bank': buy_best_bank
+        },
+        'people_buying': {
+            'min': sell_min,
+            'max': sell_max,
+            'avg': sell_sum / count,
+            'best_bank': sell_best_bank
+        }
+    }
+
+
 # ============================================================
 # MONGODB
 # ============================================================
 
+# Collections whose date index this process has already ensured
+_INDEXED_COLLECTIONS = set()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(connection_string):
+    """One MongoClient per connection string, so repeat handlers share its pool"""
+    return MongoClient(
+        connection_string,
+        serverSelectionTimeoutMS=10000,
+        connectTimeoutMS=10000,
+        socketTimeoutMS=10000
+    )
+
+
 class ExchangeRateDB:
     """MongoDB handler optimized for GitHub Actions execution"""
 
@@ -147,16 +290,19 @@ class ExchangeRateDB:
             raise ValueError(error_msg)
 
         try:
-            self.client = MongoClient(
-                connection_string,
-                serverSelectionTimeoutMS=10000,
-                connectTimeoutMS=10000,
-                socketTimeoutMS=10000
-            )
+            self.client = _get_client(connection_string)
             self.db = self.client[db_name]
             self.collection = self.db.daily_gbp_rates
-            self.collection.create_index([("date", ASCENDING)], unique=True)
-            self.client.admin.command('ping')
+            if self.collection.full_name not in _INDEXED_COLLECTIONS:
+                self.collection.create_index([("date", ASCENDING)], unique=True)
+                _INDEXED_COLLECTIONS.add(self.collection.full_name)
+            # Diagnostic only, so writes are fire-and-forget
+            self.events = self.db.get_collection('scrape_events', write_concern=WriteConcern(w=0))
+            if self.events.full_name not in _INDEXED_COLLECTIONS:
+                # Acknowledged handle for the index, so a failed create is not silently dropped
+                self.db.scrape_events.create_index([("timestamp", ASCENDING)],
+                                                   expireAfterSeconds=SCRAPE_EVENT_TTL_SECONDS)
+                _INDEXED_COLLECTIONS.add(self.events.full_name)
             self.logger.info(f"✅ Connected to MongoDB Atlas database: {db_name}")
 
         except ConnectionFailure as e:
@@ -166,135 +312,125 @@ class ExchangeRateDB:
             self.logger.error(f"❌ MongoDB connection error: {e}")
             raise
 
-    def create_daily_document(self, bank_data_list):
-        """Create or update daily document with bank exchange rates"""
-        current_date = datetime.now().strftime('%Y-%m-%d')
-        current_datetime = datetime.now()
+    def create_daily_document(self, bank_data_list, now=None):
+        """Build the per-bank rates and run metadata merged into the daily document"""
+        current_datetime = now or datetime.now()
+        current_date = current_datetime.strftime('%Y-%m-%d')
 
         bank_rates = {}
-        bank_summary = []
 
         for bank_info in bank_data_list:
             bank_name = bank_info['bank']
+            buying_rate = bank_info['buying_rate']
+            selling_rate = bank_info['selling_rate']
+            spread = selling_rate - buying_rate
+            source = bank_info.get('source', 'direct')
             bank_rates[bank_name] = {
-                'buying_rate': bank_info['buying_rate'],
-                'selling_rate': bank_info['selling_rate'],
-                'spread': bank_info['selling_rate'] - bank_info['buying_rate'],
+                'buying_rate': buying_rate,
+                'selling_rate': selling_rate,
+                'spread': spread,
                 'last_updated': current_datetime,
-                'source': bank_info.get('source', 'direct')
-            }
-            bank_summary.append({
-                'bank_name': bank_name,
-                'buying_rate': bank_info['buying_rate'],
-                'selling_rate': bank_info['selling_rate'],
-                'spread': bank_info['selling_rate'] - bank_info['buying_rate'],
-                'source': bank_info.get('source', 'direct')
-            })
-
-        buying_rates = [bank['buying_rate'] for bank in bank_data_list]
-        selling_rates = [bank['selling_rate'] for bank in bank_data_list]
-
-        market_stats = {
-            'people_selling': {
-                'min': min(buying_rates),
-                'max': max(buying_rates),
-                'avg': sum(buying_rates) / len(buying_rates),
-                'best_bank': max(bank_data_list, key=lambda x: x['buying_rate'])['bank']
-            },
-            'people_buying': {
-                'min': min(selling_rates),
-                'max': max(selling_rates),
-                'avg': sum(selling_rates) / len(selling_rates),
-                'best_bank': min(bank_data_list, key=lambda x: x['selling_rate'])['bank']
+                'source': source
             }
-        }
 
+        # bank_summary, totals and market_statistics are recomputed server-side on upsert
         document = {
             'date': current_date,
             'last_updated': current_datetime,
             'currency': CURRENCY,
             'source': 'direct_bank_scraping',
-            'total_banks': len(bank_data_list),
             'bank_rates': bank_rates,
-            'bank_summary': bank_summary,
-            'market_statistics': market_stats,
             'execution_environment': {
-                'github_actions': bool(os.getenv('GITHUB_ACTIONS')),
-                'runner_os': os.getenv('RUNNER_OS', 'unknown'),
-                'workflow_run_id': os.getenv('GITHUB_RUN_ID'),
-                'timezone': os.getenv('TZ', 'UTC')
-            },
-            'data_completeness': {
-                'banks_updated': list(bank_rates.keys()),
-                'banks_count': len(bank_rates),
-                'update_timestamp': current_datetime
+                'github_actions': GITHUB_ACTIONS,
+                'runner_os': RUNNER_OS,
+                'workflow_run_id': WORKFLOW_RUN_ID,
+                'timezone': TIMEZONE
             }
         }
         return document
 
-    def upsert_daily_rates(self, bank_data_list):
+    @staticmethod
+    def _best_bank_expr(rate_field, best_rate):
+        """Pipeline expression for the first bank in bank_summary quoting best_rate"""
+        return {'$arrayElemAt': [
+            {'$map': {
+                'input': {'$filter': {
+                    'input': '$bank_summary',
+                    'as': 'bank',
+                    'cond': {'$eq': [f'$$bank.{rate_field}', best_rate]}
+                }},
+                'as': 'bank',
+                'in': '$$bank.bank_name'
+            }},
+            0
+        ]}
+
+    def upsert_daily_rates(self, bank_data_list, now=None):
         """Insert or update daily exchange rates with enhanced logging"""
         try:
-            current_date = datetime.now().strftime('%Y-%m-%d')
-            new_document = self.create_daily_document(bank_data_list)
-
-            existing = self.collection.find_one({'date': current_date})
-
-            if existing:
-                existing_banks = existing.get('bank_rates', {})
-                new_banks = new_document['bank_rates']
-                merged_banks = {**existing_banks, **new_banks}
-                merged_summary = []
-                for bank_name, bank_data in merged_banks.items():
-                    merged_summary.append({
-                        'bank_name': bank_name,
-                        'buying_rate': bank_data['buying_rate'],
-                        'selling_rate': bank_data['selling_rate'],
-                        'spread': bank_data['spread'],
-                        'source': bank_data.get('source', 'direct')
-                    })
-
-                all_buying = [b['buying_rate'] for b in merged_summary]
-                all_selling = [b['selling_rate'] for b in merged_summary]
-
-                updated_market_stats = {
-                    'people_selling': {
-                        'min': min(all_buying),
-                        'max': max(all_buying),
-                        'avg': sum(all_buying) / len(all_buying),
-                        'best_bank': max(merged_summary, key=lambda x: x['buying_rate'])['bank_name']
-                    },
-                    'people_buying': {
-                        'min': min(all_selling),
-                        'max': max(all_selling),
-                        'avg': sum(all_selling) / len(all_selling),
-                        'best_bank': min(merged_summary, key=lambda x: x['selling_rate'])['bank_name']
-                    }
-                }
-
-                update_data = {
-                    '$set': {
-                        'last_updated': datetime.now(),
-                        'total_banks': len(merged_banks),
-                        'bank_rates': merged_banks,
-                        'bank_summary': merged_summary,
-                        'market_statistics': updated_market_stats,
-                        'execution_environment': new_document['execution_environment'],
-                        'data_completeness.banks_updated': list(new_banks.keys()),
-                        'data_completeness.banks_count': len(merged_banks),
-                        'data_completeness.update_timestamp': datetime.now()
+            new_document = self.create_daily_document(bank_data_list, now)
+            current_date = new_document['date']
+            new_banks = new_document['bank_rates']
+
+            # Merge today's banks and recompute statistics server-side in one round trip
+            pipeline = [
+                {'$set': {
+                    'last_updated': new_document['last_updated'],
+                    'currency': new_document['currency'],
+                    'source': new_document['source'],
+                    'bank_rates': {'$mergeObjects': [
+                        {'$ifNull': ['$bank_rates', {}]},
+                        {'$literal': new_banks}
+                    ]},
+                    'execution_environment': {'$literal': new_document['execution_environment']},
+                    'data_completeness.banks_updated': {'$literal': list(new_banks.keys())},
+                    'data_completeness.update_timestamp': new_document['last_updated']
+                }},
+                {'$set': {
+                    'bank_summary': {'$map': {
+                        'input': {'$objectToArray': '$bank_rates'},
+                        'as': 'bank',
+                        'in': {
+                            'bank_name': '$$bank.k',
+                            'buying_rate': '$$bank.v.buying_rate',
+                            'selling_rate': '$$bank.v.selling_rate',
+                            'spread': '$$bank.v.spread',
+                            'source': {'$ifNull': ['$$bank.v.source', 'direct']}
+                        }
+                    }}
+                }},
+                {'$set': {
+                    'total_banks': {'$size': '$bank_summary'},
+                    'data_completeness.banks_count': {'$size': '$bank_summary'},
+                    'market_statistics': {
+                        'people_selling': {
+                            'min': {'$min': '$bank_summary.buying_rate'},
+                            'max': {'$max': '$bank_summary.buying_rate'},
+                            'avg': {'$avg': '$bank_summary.buying_rate'}
+                        },
+                        'people_buying': {
+                            'min': {'$min': '$bank_summary.selling_rate'},
+                            'max': {'$max': '$bank_summary.selling_rate'},
+                            'avg': {'$avg': '$bank_summary.selling_rate'}
+                        }
                     }
-                }
-
-                self.collection.update_one({'date': current_date}, update_data)
-                self.logger.info(f"✅ Updated document for {current_date}")
-                self.logger.info(f"📊 Previous banks: {list(existing_banks.keys())}")
-                self.logger.info(f"🔄 Updated banks: {list(new_banks.keys())}")
-                self.logger.info(f"📈 Total banks now: {len(merged_banks)}")
-            else:
-                self.collection.insert_one(new_document)
+                }},
+                {'$set': {
+                    'market_statistics.people_selling.best_bank': self._best_bank_expr(
+                        'buying_rate', '$market_statistics.people_selling.max'
+                    ),
+                    'market_statistics.people_buying.best_bank': self._best_bank_expr(
+                        'selling_rate', '$market_statistics.people_buying.min'
+                    )
+                }}
+            ]
+
+            result = self.collection.update_one({'date': current_date}, pipeline, upsert=True)
+            if result.upserted_id is not None:
                 self.logger.info(f"🆕 Created new document for {current_date}")
-                self.logger.info(f"📊 Banks added: {list(new_document['bank_rates'].keys())}")
+            else:
+                self.logger.info(f"✅ Updated document for {current_date}")
+            self.logger.info(f"🔄 Updated banks: {list(new_banks.keys())}")
 
             return True
 
@@ -302,6 +438,15 @@ class ExchangeRateDB:
             self.logger.error(f"❌ Error saving to MongoDB Atlas: {e}")
             return False
 
+    def log_scrape_events(self, events):
+        """Record per-bank scrape outcomes without waiting for acknowledgement"""
+        if not events:
+            return
+        try:
+            self.events.insert_many(events, ordered=False)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not record scrape events: {e}")
+
     def get_daily_rates(self, date=None):
         """Get exchange rates for a specific date"""
         if date is None:
@@ -312,6 +457,8 @@ class ExchangeRateDB:
         """Close MongoDB connection"""
         if hasattr(self, 'client'):
             self.client.close()
+            # A closed client can't be reused, so the next handler must build a new one
+            _get_client.cache_clear()
             self.logger.info("🔌 MongoDB connection closed")
 
 
@@ -319,14 +466,39 @@ class ExchangeRateDB:
 # SELENIUM SETUP
 # ============================================================
 
+# Subresources the scrapers never read; blocked at the network layer
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp',
+    '*.woff', '*.woff2', '*.ttf', '*.css',
+    '*google-analytics*', '*googletagmanager*', '*gtag*', '*facebook*', '*doubleclick*'
+]
+
+
+@functools.lru_cache(maxsize=1)
+def get_chromedriver_path():
+    """Resolve an explicitly configured ChromeDriver binary once per run.
+
+    The workflow restores ChromeDriver from ~/.cache/chromedriver (keyed on the
+    Chrome version), installs it to /usr/local/bin/chromedriver and exports
+    CHROMEDRIVER_PATH, so Selenium Manager's driver lookup is skipped entirely.
+    Without a configured binary, Selenium Manager resolves the driver matching
+    the installed Chrome.
+    """
+    driver_path = os.getenv('CHROMEDRIVER_PATH')
+    if not driver_path and GITHUB_ACTIONS:
+        driver_path = '/usr/local/bin/chromedriver'
+    if driver_path and Path(driver_path).is_file():
+        return driver_path
+    return None
+
+
 def setup_selenium_for_github_actions():
     """Setup Selenium WebDriver optimized for GitHub Actions"""
     try:
         chrome_options = Options()
-        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--headless=new')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--disable-extensions')
         chrome_options.add_argument('--disable-web-security')
         chrome_options.add_argument('--disable-features=VizDisplayCompositor')
@@ -335,12 +507,28 @@ def setup_selenium_for_github_actions():
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Rates are read from the DOM text, so skip downloading images;
+        # CSS and fonts are blocked through BLOCKED_URL_PATTERNS once the driver starts
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2
+        })
+
+        # Return from driver.get() at DOMContentLoaded; scrapers poll for their data
+        chrome_options.page_load_strategy = 'eager'
 
-        if os.getenv('GITHUB_ACTIONS'):
+        if GITHUB_ACTIONS:
             chrome_options.binary_location = '/usr/bin/google-chrome'
 
-        driver = webdriver.Chrome(options=chrome_options)
+        driver_path = get_chromedriver_path()
+        service = Service(executable_path=driver_path) if driver_path else Service()
+        driver = webdriver.Chrome(service=service, options=chrome_options)
         driver.set_page_load_timeout(30)
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logging.warning(f"⚠️ Could not block subresources via CDP: {e}")
         return driver
 
     except NameError:
@@ -351,11 +539,48 @@ def setup_selenium_for_github_actions():
         return None
 
 
+_DRIVER = None
+_DRIVER_LOCK = threading.Lock()
+
+
+def get_selenium_driver():
+    """Return the shared Chrome driver, launching it on first use.
+
+    Chrome start-up dominates Selenium scrape time, so every Selenium-based
+    scraper in a run shares one browser. Callers must not quit the driver;
+    main() does that once via quit_selenium_driver().
+    """
+    global _DRIVER
+    with _DRIVER_LOCK:
+        if _DRIVER is None:
+            _DRIVER = setup_selenium_for_github_actions()
+        else:
+            # Start each site from a clean slate without relaunching Chrome
+            try:
+                _DRIVER.delete_all_cookies()
+                _DRIVER.get("about:blank")
+            except Exception:
+                _DRIVER = setup_selenium_for_github_actions()
+        return _DRIVER
+
+
+def quit_selenium_driver():
+    """Quit the shared Chrome driver if one was started"""
+    global _DRIVER
+    with _DRIVER_LOCK:
+        if _DRIVER is not None:
+            try:
+                _DRIVER.quit()
+            except Exception:
+                pass
+            _DRIVER = None
+
+
 # ============================================================
 # DIRECT BANK SCRAPING FUNCTIONS
 # ============================================================
 
-def scrape_boc_rates(logger):
+def scrape_boc_rates(logger, timestamp=None):
     """Scrape GBP exchange rates from Bank of Ceylon website"""
     url = "https://www.boc.lk/rates-tariff"
     try:
@@ -364,36 +589,35 @@ def scrape_boc_rates(logger):
             url, HEADERS, logger, "BOC"
         )
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        tables = soup.find_all('table')
-
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                row_text = [cell.get_text(strip=True) for cell in cells]
-
-                # BOC uses currency code as first cell (e.g., 'GBP')
-                if len(row_text) > 0 and row_text[0] == CURRENCY and len(row_text) >= 3:
-                    numeric_values = []
-                    for cell in row_text[1:]:
-                        numbers = re.findall(r'\d+\.\d+', cell)
-                        for num in numbers:
-                            if float(num) > 50:
-                                numeric_values.append(float(num))
-
-                    if len(numeric_values) >= 2:
-                        result = {
-                            'bank': normalize_bank_name('Bank of Ceylon'),
-                            'currency': CURRENCY,
-                            'buying_rate': numeric_values[0],
-                            'selling_rate': numeric_values[1],
-                            'source': 'BOC Direct' if not used_fallback else 'BOC via Google Translate',
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'source_url': url
-                        }
-                        logger.info(f"  ✅ BOC - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
-                        return result
+        # Cheap byte scan so a page without the currency is never parsed
+        if CURRENCY.encode() not in response.content:
+            logger.warning(f"  ⚠️ {CURRENCY} not found in BOC page")
+            return None
+
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('table'))
+        for row in soup.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            row_text = [cell.get_text(strip=True) for cell in cells]
+
+            # BOC uses currency code as first cell (e.g., 'GBP')
+            if len(row_text) > 0 and row_text[0] == CURRENCY and len(row_text) >= 3:
+                numeric_values = []
+                for cell in row_text[1:]:
+                    numbers = RATE_PATTERN.findall(cell)
+                    numeric_values.extend(v for v in map(float, numbers) if v > 50)
+
+                if len(numeric_values) >= 2:
+                    result = {
+                        'bank': normalize_bank_name('Bank of Ceylon'),
+                        'currency': CURRENCY,
+                        'buying_rate': numeric_values[0],
+                        'selling_rate': numeric_values[1],
+                        'source': 'BOC Direct' if not used_fallback else 'BOC via Google Translate',
+                        'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'source_url': url
+                    }
+                    logger.info(f"  ✅ BOC - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
+                    return result
 
         logger.warning(f"  ⚠️ {CURRENCY} not found in BOC tables")
         return None
@@ -403,7 +627,7 @@ def scrape_boc_rates(logger):
         return None
 
 
-def scrape_combank_rates(logger):
+def scrape_combank_rates(logger, timestamp=None):
     """Scrape GBP exchange rates from Commercial Bank's public JSON API."""
     url = "https://www.combank.lk/api/exchange-rates/"
     try:
@@ -420,7 +644,7 @@ def scrape_combank_rates(logger):
                     'buying_rate': float(rate['currency_buying_rate']),
                     'selling_rate': float(rate['currency_selling_rate']),
                     'source': 'Combank API' if not used_fallback else 'Combank API via Google Translate',
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'source_url': url
                 }
                 logger.info(f"  ✅ Combank - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
@@ -434,44 +658,38 @@ def scrape_combank_rates(logger):
         return None
 
 
-def scrape_amana_rates(logger):
+def scrape_amana_rates(logger, timestamp=None):
     """Scrape GBP exchange rates from Amana Bank website"""
     url = "https://www.amanabank.lk/business/treasury/exchange-rates.html"
     try:
         logger.info("🏦 Scraping Amana Bank...")
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = SESSION.get(url, headers=HEADERS, timeout=15)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        tables = soup.find_all('table')
-
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                row_text = [cell.get_text(strip=True) for cell in cells]
-
-                # Match currency using CURRENCY_NAMES list
-                if len(row_text) > 0 and any(name in c for c in row_text for name in CURRENCY_NAMES):
-                    numeric_values = []
-                    for cell in row_text[1:]:
-                        numbers = re.findall(r'\d+\.\d+', cell)
-                        for num in numbers:
-                            if float(num) > 50:
-                                numeric_values.append(float(num))
-
-                    if len(numeric_values) >= 2:
-                        result = {
-                            'bank': normalize_bank_name('Amana Bank'),
-                            'currency': CURRENCY,
-                            'buying_rate': numeric_values[0],
-                            'selling_rate': numeric_values[1],
-                            'source': 'Amana Direct',
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'source_url': url
-                        }
-                        logger.info(f"  ✅ Amana - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
-                        return result
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('table'))
+        for row in soup.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            row_text = [cell.get_text(strip=True) for cell in cells]
+
+            # Match currency using CURRENCY_NAMES list
+            if len(row_text) > 0 and any(name in c for c in row_text for name in CURRENCY_NAMES):
+                numeric_values = []
+                for cell in row_text[1:]:
+                    numbers = RATE_PATTERN.findall(cell)
+                    numeric_values.extend(v for v in map(float, numbers) if v > 50)
+
+                if len(numeric_values) >= 2:
+                    result = {
+                        'bank': normalize_bank_name('Amana Bank'),
+                        'currency': CURRENCY,
+                        'buying_rate': numeric_values[0],
+                        'selling_rate': numeric_values[1],
+                        'source': 'Amana Direct',
+                        'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'source_url': url
+                    }
+                    logger.info(f"  ✅ Amana - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
+                    return result
 
         logger.warning(f"  ⚠️ {CURRENCY} not found in Amana tables")
         return None
@@ -481,44 +699,38 @@ def scrape_amana_rates(logger):
         return None
 
 
-def scrape_peoples_bank_rates(logger):
+def scrape_peoples_bank_rates(logger, timestamp=None):
     """Scrape GBP exchange rates from People's Bank website"""
     url = "https://www.peoplesbank.lk/exchange-rates/"
     try:
         logger.info("🏦 Scraping People's Bank...")
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = SESSION.get(url, headers=HEADERS, timeout=15)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        tables = soup.find_all('table')
-
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                row_text = [cell.get_text(strip=True) for cell in cells]
-
-                if len(row_text) > 0 and any('Pound Sterling' in cell for cell in row_text):
-                    numeric_values = []
-                    for cell in row_text[1:]:
-                        clean_cell = cell.replace(',', '')
-                        numbers = re.findall(r'\d+\.\d+', clean_cell)
-                        for num in numbers:
-                            if float(num) > 50:
-                                numeric_values.append(float(num))
-
-                    if len(numeric_values) >= 2:
-                        result = {
-                            'bank': normalize_bank_name("People's Bank"),
-                            'currency': CURRENCY,
-                            'buying_rate': numeric_values[0],
-                            'selling_rate': numeric_values[1],
-                            'source': "People's Bank Direct",
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'source_url': url
-                        }
-                        logger.info(f"  ✅ People's Bank - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
-                        return result
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('table'))
+        for row in soup.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            row_text = [cell.get_text(strip=True) for cell in cells]
+
+            if len(row_text) > 0 and any('Pound Sterling' in cell for cell in row_text):
+                numeric_values = []
+                for cell in row_text[1:]:
+                    clean_cell = cell.replace(',', '')
+                    numbers = RATE_PATTERN.findall(clean_cell)
+                    numeric_values.extend(v for v in map(float, numbers) if v > 50)
+
+                if len(numeric_values) >= 2:
+                    result = {
+                        'bank': normalize_bank_name("People's Bank"),
+                        'currency': CURRENCY,
+                        'buying_rate': numeric_values[0],
+                        'selling_rate': numeric_values[1],
+                        'source': "People's Bank Direct",
+                        'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'source_url': url
+                    }
+                    logger.info(f"  ✅ People's Bank - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
+                    return result
 
         logger.warning(f"  ⚠️ {CURRENCY} not found in People's Bank tables")
         return None
@@ -528,44 +740,92 @@ def scrape_peoples_bank_rates(logger):
         return None
 
 
-def scrape_hnb_rates(logger, screenshots_dir):
-    """Scrape GBP exchange rates from HNB website using Selenium"""
-    url = "https://www.hnb.lk/"
-    driver = None
-    try:
-        logger.info("🏦 Scraping HNB (Selenium)...")
-        driver = setup_selenium_for_github_actions()
-        if not driver:
-            return None
+def find_hnb_rate_pair(page_source):
+    """Return the sorted rate pair quoted just after the first matching currency anchor"""
+    for anchor in HNB_ANCHOR_PATTERN.finditer(page_source):
+        window = page_source[anchor.end():anchor.end() + HNB_RATE_WINDOW]
+        rates = [v for v in map(float, HNB_RATE_NUMBER_PATTERN.findall(window)) if 100 <= v <= 500]
+        if len(rates) >= 2:
+            return sorted(rates[:2])
+    return None
 
-        driver.get(url)
 
-        # HNB renders currency rates into a shared carousel widget via JS.
-        # A fixed sleep is a race: not every currency (e.g. EUR) is always
-        # populated in time, causing intermittent false "not found" results.
-        # Poll page_source until this currency's own rate pair shows up.
-        rate_pattern = re.compile(r'(?i)(?:GBP|Pound|Sterling).*?(\d{2,3}\.\d{1,4}).*?(\d{2,3}\.\d{1,4})')
-        try:
-            WebDriverWait(driver, 25).until(lambda d: rate_pattern.search(d.page_source))
-        except TimeoutException:
-            logger.warning(f"  \u26a0\ufe0f Timed out waiting for {CURRENCY} rates to render on HNB")
-
-        match = rate_pattern.search(driver.page_source)
-        if match:
-            rates = [float(g) for g in match.groups() if 100 <= float(g) <= 500]
-            if len(rates) >= 2:
-                rates.sort()
-                result = {
-                    'bank': normalize_bank_name('Hatton National Bank'),
-                    'currency': CURRENCY,
-                    'buying_rate': rates[0],
-                    'selling_rate': rates[1],
-                    'source': 'HNB Direct',
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'source_url': url
-                }
-                logger.info(f"  \u2705 HNB - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
-                return result
+def find_hnb_rate_pair_in_dom(driver):
+    """Search the rendered page inside the browser, shipping back only the anchor snippets"""
+    snippets = driver.execute_script(HNB_SNIPPET_SCRIPT, HNB_ANCHORS, HNB_RATE_WINDOW)
+    for snippet in snippets or []:
+        rates = find_hnb_rate_pair(snippet)
+        if rates:
+            return rates
+    return None
+
+
+def fetch_hnb_rates_static(url, logger):
+    """Look for the rate pair in HNB's server-rendered rate table, skipping the browser when it is there"""
+    try:
+        response = SESSION.get(url, headers=HEADERS, timeout=10)
+        response.raise_for_status()
+        tree = lxml.html.fromstring(response.content)
+    except Exception as e:
+        logger.info(f"  HNB static fetch failed ({e}); falling back to Selenium")
+        return None
+    # Only the table row holding the anchor, so fonts, meta tags and SVG paths elsewhere can't match
+    rows = tree.xpath('//text()[re:test(., $anchors, "i")]/ancestor::tr[1]',
+                      namespaces={'re': HNB_EXSLT_REGEX_NS}, anchors=HNB_ANCHORS)
+    for row in rows:
+        row_text = ' '.join(row.xpath('.//text()'))
+        rates = [v for v in map(float, HNB_RATE_NUMBER_PATTERN.findall(row_text)) if 100 <= v <= 500]
+        if len(rates) >= 2:
+            return sorted(rates[:2])
+    return None
+
+
+def scrape_hnb_rates(logger, screenshots_dir, timestamp=None):
+    """Scrape GBP exchange rates from HNB website, using Selenium when the static page lacks them"""
+    url = "https://www.hnb.lk/"
+    try:
+        logger.info("🏦 Scraping HNB...")
+        rates = fetch_hnb_rates_static(url, logger)
+
+        if not rates:
+            logger.info("  HNB rates not in static HTML; rendering with Selenium")
+            driver = get_selenium_driver()
+            if not driver:
+                return None
+
+            driver.get(url)
+
+            # HNB renders currency rates into a shared carousel widget via JS.
+            # A fixed sleep is a race: not every currency (e.g. EUR) is always
+            # populated in time, causing intermittent false "not found" results.
+            # Poll the rendered text until this currency's own rate pair shows up.
+            try:
+                rates = WebDriverWait(driver, 25).until(find_hnb_rate_pair_in_dom)
+            except TimeoutException:
+                logger.warning(f"  \u26a0\ufe0f Timed out waiting for {CURRENCY} rates to render on HNB")
+                rates = None
+
+            if not rates:
+                # Screenshots cost a Chrome round trip and a PNG encode, so only failed renders get one
+                try:
+                    screenshot = screenshots_dir / f"hnb_{CURRENCY.lower()}_{datetime.now().strftime('%H%M%S')}.png"
+                    driver.save_screenshot(str(screenshot))
+                    logger.info(f"  \U0001f4f8 HNB screenshot saved to {screenshot}")
+                except WebDriverException as e:
+                    logger.warning(f"  \u26a0\ufe0f Could not save HNB screenshot: {e}")
+
+        if rates:
+            result = {
+                'bank': normalize_bank_name('Hatton National Bank'),
+                'currency': CURRENCY,
+                'buying_rate': rates[0],
+                'selling_rate': rates[1],
+                'source': 'HNB Direct',
+                'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'source_url': url
+            }
+            logger.info(f"  \u2705 HNB - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
+            return result
 
         logger.warning("  \u26a0\ufe0f HNB scraping failed")
         return None
@@ -573,12 +833,9 @@ def scrape_hnb_rates(logger, screenshots_dir):
     except Exception as e:
         logger.error(f"  \u274c Error scraping HNB: {e}")
         return None
-    finally:
-        if driver:
-            driver.quit()
 
 
-def scrape_ntb_rates(logger, screenshots_dir):
+def scrape_ntb_rates(logger, screenshots_dir, timestamp=None):
     """Scrape GBP exchange rates from NTB website using text parsing"""
     url = "https://www.nationstrust.com/exchange-rates"
     try:
@@ -587,13 +844,17 @@ def scrape_ntb_rates(logger, screenshots_dir):
             url, HEADERS, logger, "NTB"
         )
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        page_text = soup.get_text()
-
-        if CURRENCY not in page_text:
+        # Cheap byte scan so a page without the currency is never parsed
+        if CURRENCY.encode() not in response.content:
             logger.warning(f"  ⚠️ {CURRENCY} not found in NTB page")
             return None
 
+        # Only the flattened text is needed, so skip building a BeautifulSoup tree.
+        # Unlike get_text(), text_content() keeps script and style text, so drop those first
+        tree = lxml.html.fromstring(response.content)
+        lxml.etree.strip_elements(tree, 'script', 'style', with_tail=False)
+        page_text = tree.text_content()
+
         # NTB page structure: currency code on one line, then rates on subsequent lines
         # Pattern: CURRENCY_CODE / DD_Buy / DD_Sell / TT_Buy / TT_Sell / ...
         lines = [l.strip() for l in page_text.split('\n') if l.strip()]
@@ -620,7 +881,7 @@ def scrape_ntb_rates(logger, screenshots_dir):
                         'buying_rate': numeric_values[buy_idx],
                         'selling_rate': numeric_values[sell_idx],
                         'source': 'NTB Direct' if not used_fallback else 'NTB via Google Translate',
-                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                         'source_url': url
                     }
                     logger.info(f"  ✅ NTB - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
@@ -634,28 +895,28 @@ def scrape_ntb_rates(logger, screenshots_dir):
         return None
 
 
-def scrape_cbsl_rates(logger):
+def scrape_cbsl_rates(logger, timestamp=None):
     """Scrape GBP exchange rates from the Central Bank of Sri Lanka (indicative TT rate)"""
     url = f"https://www.cbsl.gov.lk/cbsl_custom/charts/{CURRENCY.lower()}/indexsmall.php"
     try:
         logger.info("🏦 Scraping Central Bank of Sri Lanka...")
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = SESSION.get(url, headers=HEADERS, timeout=15)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('p'))
         buying_rate = None
         selling_rate = None
 
         for p in soup.find_all('p'):
             text = p.get_text(' ', strip=True)
             if text.startswith('Buy'):
-                match = re.search(r'(\d+\.\d+)', text)
+                match = RATE_PATTERN.search(text)
                 if match:
-                    buying_rate = float(match.group(1))
+                    buying_rate = float(match.group())
             elif text.startswith('Sell'):
-                match = re.search(r'(\d+\.\d+)', text)
+                match = RATE_PATTERN.search(text)
                 if match:
-                    selling_rate = float(match.group(1))
+                    selling_rate = float(match.group())
 
         if buying_rate is not None and selling_rate is not None:
             result = {
@@ -664,7 +925,7 @@ def scrape_cbsl_rates(logger):
                 'buying_rate': buying_rate,
                 'selling_rate': selling_rate,
                 'source': 'CBSL Direct',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'source_url': url
             }
             logger.info(f"  \u2705 CBSL - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
@@ -678,12 +939,12 @@ def scrape_cbsl_rates(logger):
         return None
 
 
-def scrape_sampath_rates(logger, screenshots_dir):
+def scrape_sampath_rates(logger, screenshots_dir, timestamp=None):
     """Scrape GBP exchange rates from Sampath Bank JSON API"""
     api_url = "https://www.sampath.lk/api/exchange-rates"
     try:
         logger.info("🏦 Scraping Sampath Bank (API)...")
-        response = requests.get(api_url, headers=HEADERS, timeout=15)
+        response = SESSION.get(api_url, headers=HEADERS, timeout=15)
         response.raise_for_status()
 
         data = response.json()
@@ -703,7 +964,7 @@ def scrape_sampath_rates(logger, screenshots_dir):
                     'buying_rate': tt_buy,
                     'selling_rate': tt_sell,
                     'source': 'Sampath API',
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'source_url': api_url
                 }
                 logger.info(f"  ✅ Sampath - Buy: {result['buying_rate']}, Sell: {result['selling_rate']}")
@@ -722,84 +983,142 @@ def scrape_sampath_rates(logger, screenshots_dir):
 # OUTPUT & SUMMARY
 # ============================================================
 
-def create_execution_summary(bank_data_list, logger):
+def create_execution_summary(bank_data_list, logger, market_stats=None):
     """Create execution summary for GitHub Actions"""
     summary_data = {
         'execution_time': datetime.now().isoformat(),
         'currency': CURRENCY,
         'total_banks_scraped': len(bank_data_list),
         'banks_list': [bank['bank'] for bank in bank_data_list],
-        'sources_used': list(set(bank.get('source', 'direct') for bank in bank_data_list)),
-        'github_actions': bool(os.getenv('GITHUB_ACTIONS')),
-        'workflow_run_id': os.getenv('GITHUB_RUN_ID'),
-        'runner_os': os.getenv('RUNNER_OS', 'unknown'),
-        'timezone': os.getenv('TZ', 'UTC'),
+        'sources_used': list(dict.fromkeys(bank.get('source', 'direct') for bank in bank_data_list)),
+        'github_actions': GITHUB_ACTIONS,
+        'workflow_run_id': WORKFLOW_RUN_ID,
+        'runner_os': RUNNER_OS,
+        'timezone': TIMEZONE,
         'execution_status': 'success' if bank_data_list else 'failed'
     }
 
     if bank_data_list:
-        best_selling_bank = max(bank_data_list, key=lambda x: x['buying_rate'])
-        best_buying_bank = min(bank_data_list, key=lambda x: x['selling_rate'])
+        stats = market_stats or compute_market_statistics(bank_data_list)
+        people_selling = stats['people_selling']
+        people_buying = stats['people_buying']
 
         summary_data.update({
             'best_rate_to_sell': {
-                'bank': best_selling_bank['bank'],
-                'rate': best_selling_bank['buying_rate']
+                'bank': people_selling['best_bank'],
+                'rate': people_selling['max']
             },
             'best_rate_to_buy': {
-                'bank': best_buying_bank['bank'],
-                'rate': best_buying_bank['selling_rate']
+                'bank': people_buying['best_bank'],
+                'rate': people_buying['min']
             },
-            'average_buying_rate': sum(bank['buying_rate'] for bank in bank_data_list) / len(bank_data_list),
-            'average_selling_rate': sum(bank['selling_rate'] for bank in bank_data_list) / len(bank_data_list)
+            'average_buying_rate': people_selling['avg'],
+            'average_selling_rate': people_buying['avg']
         })
 
+    # Serialize in memory, then swap the file in atomically so a killed run never leaves partial JSON
     summary_file = Path(f"{CURRENCY.lower()}_execution_summary.json")
-    with open(summary_file, 'w') as f:
-        json.dump(summary_data, f, indent=2, default=str)
+    temp_file = summary_file.with_suffix('.json.tmp')
+    if orjson is not None:
+        payload = orjson.dumps(summary_data, option=orjson.OPT_INDENT_2, default=str)
+    else:
+        payload = json.dumps(summary_data, indent=2, default=str).encode()
+    temp_file.write_bytes(payload)
+    os.replace(temp_file, summary_file)
 
     logger.info(f"📋 Execution summary saved to {summary_file}")
     return summary_data
 
 
-def print_bank_rates(bank_data_list, logger):
+# Report rules, built once rather than on every print
+REPORT_RULE = "=" * 80
+BANK_RULE = "-" * 50
+
+
+def print_bank_rates(bank_data_list, logger, market_stats=None):
     """Print bank rates in a formatted way"""
     if not bank_data_list:
         logger.error("❌ No bank data found")
         return
 
-    logger.info("=" * 80)
-    logger.info(f"🏦 ALL BANKS - {CURRENCY} EXCHANGE RATES (People's Perspective)")
-    logger.info("=" * 80)
+    # The report is INFO-only, so skip building it when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
+    stats = market_stats or compute_market_statistics(bank_data_list)
+    people_selling = stats['people_selling']
+    people_buying = stats['people_buying']
+    sources = Counter(bank.get('source', 'direct') for bank in bank_data_list)
+
+    # Build the whole report and emit it as one log record
+    lines = [
+        REPORT_RULE,
+        f"🏦 ALL BANKS - {CURRENCY} EXCHANGE RATES (People's Perspective)",
+        REPORT_RULE
+    ]
     for bank_info in bank_data_list:
         spread = bank_info['selling_rate'] - bank_info['buying_rate']
-        logger.info(f"🏦 {bank_info['bank']} [{bank_info.get('source', 'N/A')}]")
-        logger.info(f"   💰 Sell {CURRENCY} For: LKR {bank_info['buying_rate']:.2f}")
-        logger.info(f"   💸 Buy {CURRENCY} For:  LKR {bank_info['selling_rate']:.2f}")
-        logger.info(f"   📊 Spread:       LKR {spread:.4f}")
-        logger.info("-" * 50)
-
-    best_selling_bank = max(bank_data_list, key=lambda x: x['buying_rate'])
-    best_buying_bank = min(bank_data_list, key=lambda x: x['selling_rate'])
-
-    logger.info(f"🎯 BEST {CURRENCY} RATES FOR YOU:")
-    logger.info(f"✅ Best to Sell {CURRENCY}: LKR {best_selling_bank['buying_rate']:.2f} at {best_selling_bank['bank']}")
-    logger.info(f"✅ Best to Buy {CURRENCY}:  LKR {best_buying_bank['selling_rate']:.2f} at {best_buying_bank['bank']}")
-    logger.info(f"📈 Total Banks: {len(bank_data_list)}")
-
-    sources = {}
-    for bank in bank_data_list:
-        source = bank.get('source', 'direct')
-        sources[source] = sources.get(source, 0) + 1
-    logger.info(f"📡 Data Sources: {dict(sources)}")
-    logger.info("=" * 80)
+        lines += [
+            f"🏦 {bank_info['bank']} [{bank_info.get('source', 'N/A')}]",
+            f"   💰 Sell {CURRENCY} For: LKR {bank_info['buying_rate']:.2f}",
+            f"   💸 Buy {CURRENCY} For:  LKR {bank_info['selling_rate']:.2f}",
+            f"   📊 Spread:       LKR {spread:.4f}",
+            BANK_RULE
+        ]
+    lines += [
+        f"🎯 BEST {CURRENCY} RATES FOR YOU:",
+        f"✅ Best to Sell {CURRENCY}: LKR {people_selling['max']:.2f} at {people_selling['best_bank']}",
+        f"✅ Best to Buy {CURRENCY}:  LKR {people_buying['min']:.2f} at {people_buying['best_bank']}",
+        f"📈 Total Banks: {len(bank_data_list)}",
+        f"📡 Data Sources: {dict(sources)}",
+        REPORT_RULE
+    ]
+    logger.info("\n".join(lines))
 
 
 # ============================================================
 # MAIN
 # ============================================================
 
+async def run_scrapers(steps):
+    """Run every scraper in a worker thread so network and browser waits overlap.
+
+    Selenium scrapers share one browser, so they are queued on a single
+    dedicated thread while the requests-based scrapers run alongside them.
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='selenium') as selenium_executor:
+        return await asyncio.gather(*(
+            loop.run_in_executor(selenium_executor, scraper, *args) if uses_selenium
+            else asyncio.to_thread(scraper, *args)
+            for _, _, scraper, args, uses_selenium in steps
+        ))
+
+
+def reusable_bank_data(today_data, expected_banks):
+    """Bank rows from today's document if every bank in it was scraped recently enough to skip a rerun"""
+    bank_rates = (today_data or {}).get('bank_rates') or {}
+    if len(bank_rates) < expected_banks:
+        return None
+
+    # Check each bank rather than the document: a partial rerun refreshes the top-level last_updated
+    now = datetime.now()
+    for rates in bank_rates.values():
+        last_updated = rates.get('last_updated')
+        if not last_updated or (now - last_updated).total_seconds() > FRESH_DOCUMENT_SECONDS:
+            return None
+
+    return [
+        {
+            'bank': bank_name,
+            'buying_rate': rates['buying_rate'],
+            'selling_rate': rates['selling_rate'],
+            'source': rates.get('source', 'direct')
+        }
+        for bank_name, rates in bank_rates.items()
+    ]
+
+
 def main():
     """Main execution function - scrapes all banks directly"""
     logger = setup_logging()
@@ -813,97 +1132,82 @@ def main():
         logger.info(f"🔗 Connecting to MongoDB Atlas for {CURRENCY} data...")
         db = ExchangeRateDB(logger=logger)
 
-        all_bank_data = []
-        failed_banks = []
-
-        # Step 1: BOC (direct page with a WAF-safe fallback)
-        logger.info(f"📡 Step 1/8: Bank of Ceylon")
-        result = scrape_boc_rates(logger)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append('BOC')
-
-        # Step 2: Commercial Bank (public JSON API with a WAF-safe fallback)
-        logger.info(f"📡 Step 2/8: Commercial Bank")
-        result = scrape_combank_rates(logger)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append('Commercial Bank')
-
-        # Step 3: Amana Bank (requests + BS4)
-        logger.info(f"📡 Step 3/8: Amana Bank")
-        result = scrape_amana_rates(logger)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append('Amana Bank')
-
-        # Step 4: People's Bank (requests + BS4)
-        logger.info(f"📡 Step 4/8: People's Bank")
-        result = scrape_peoples_bank_rates(logger)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append("People's Bank")
+        # Every bank row from this run carries the same timestamp
+        run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        # (display name, failure label, scraper, args, uses Selenium)
+        steps = [
+            ("Bank of Ceylon", 'BOC', scrape_boc_rates, (logger, run_timestamp), False),
+            ("Commercial Bank", 'Commercial Bank', scrape_combank_rates, (logger, run_timestamp), False),
+            ("Amana Bank", 'Amana Bank', scrape_amana_rates, (logger, run_timestamp), False),
+            ("People's Bank", "People's Bank", scrape_peoples_bank_rates, (logger, run_timestamp), False),
+            ("Hatton National Bank", 'HNB', scrape_hnb_rates, (logger, screenshots_dir, run_timestamp), True),
+            ("Nations Trust Bank", 'NTB', scrape_ntb_rates, (logger, screenshots_dir, run_timestamp), False),
+            ("Sampath Bank", 'Sampath Bank', scrape_sampath_rates, (logger, screenshots_dir, run_timestamp), False),
+            ("Central Bank of Sri Lanka", 'CBSL', scrape_cbsl_rates, (logger, run_timestamp), False),
+        ]
 
-        # Step 5: HNB (Selenium)
-        logger.info(f"📡 Step 5/8: Hatton National Bank")
-        result = scrape_hnb_rates(logger, screenshots_dir)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append('HNB')
+        # A rerun right after a complete scrape would only rewrite the same rates
+        if not FORCE_SCRAPE:
+            reused_bank_data = reusable_bank_data(db.get_daily_rates(), len(steps))
+            if reused_bank_data:
+                logger.info(f"♻️ Today's {CURRENCY} document is complete and under {FRESH_DOCUMENT_SECONDS}s old; "
+                            "skipping the scrape (set FORCE_SCRAPE=1 to override)")
+                market_stats = compute_market_statistics(reused_bank_data)
+                print_bank_rates(reused_bank_data, logger, market_stats)
+                create_execution_summary(reused_bank_data, logger, market_stats)
+                return
 
-        # Step 6: NTB (direct page with a WAF-safe fallback)
-        logger.info(f"📡 Step 6/8: Nations Trust Bank")
-        result = scrape_ntb_rates(logger, screenshots_dir)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append('NTB')
+        for step_number, (name, *_) in enumerate(steps, start=1):
+            logger.info(f"📡 Step {step_number}/{len(steps)}: {name}")
 
-        # Step 7: Sampath Bank (JSON API)
-        logger.info(f"📡 Step 7/8: Sampath Bank")
-        result = scrape_sampath_rates(logger, screenshots_dir)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append('Sampath Bank')
+        step_results = asyncio.run(run_scrapers(steps))
+        results = {step[1]: result for step, result in zip(steps, step_results)}
 
-        # Step 8: Central Bank of Sri Lanka (requests + BS4)
-        logger.info(f"📡 Step 8/8: Central Bank of Sri Lanka")
-        result = scrape_cbsl_rates(logger)
-        if result and result.get('buying_rate'):
-            all_bank_data.append(result)
-        else:
-            failed_banks.append('CBSL')
+        all_bank_data = []
+        failed_banks = []
+        scrape_events = []
+        scraped_at = datetime.now()
+        for name, label, *_ in steps:
+            result = results[label]
+            succeeded = bool(result and result.get('buying_rate'))
+            if succeeded:
+                all_bank_data.append(result)
+            else:
+                failed_banks.append(label)
+            scrape_events.append({
+                'timestamp': scraped_at,
+                'currency': CURRENCY,
+                'bank': name,
+                'success': succeeded,
+                'buying_rate': result.get('buying_rate') if succeeded else None,
+                'selling_rate': result.get('selling_rate') if succeeded else None,
+                'workflow_run_id': WORKFLOW_RUN_ID
+            })
+        db.log_scrape_events(scrape_events)
 
         # Summary
-        logger.info(f"\n📊 Scraping complete: {len(all_bank_data)}/8 banks successful")
+        logger.info(f"\n📊 Scraping complete: {len(all_bank_data)}/{len(steps)} banks successful")
         if failed_banks:
             logger.warning(f"⚠️ Failed banks: {', '.join(failed_banks)}")
 
         # Display and save results
         if all_bank_data:
-            print_bank_rates(all_bank_data, logger)
+            market_stats = compute_market_statistics(all_bank_data)
+            print_bank_rates(all_bank_data, logger, market_stats)
 
-            success = db.upsert_daily_rates(all_bank_data)
+            success = db.upsert_daily_rates(all_bank_data, scraped_at)
 
             if success:
                 logger.info(f"🎉 [SUCCESS] Saved {len(all_bank_data)} {CURRENCY} banks to MongoDB Atlas")
                 bank_names = [bank['bank'] for bank in all_bank_data]
                 logger.info(f"🏦 {CURRENCY} Banks: {', '.join(bank_names)}")
 
-                today_data = db.get_daily_rates()
-                if today_data:
-                    logger.info(f"📊 Today's {CURRENCY} document contains {today_data['total_banks']} banks")
-                    stats = today_data['market_statistics']
-                    logger.info(f"🟢 Best {CURRENCY} Sell Rate: {stats['people_selling']['best_bank']} (LKR {stats['people_selling']['max']})")
-                    logger.info(f"🔵 Best {CURRENCY} Buy Rate: {stats['people_buying']['best_bank']} (LKR {stats['people_buying']['min']})")
+                # This run's statistics are already in hand, so don't read the document back
+                logger.info(f"🟢 Best {CURRENCY} Sell Rate: {market_stats['people_selling']['best_bank']} (LKR {market_stats['people_selling']['max']})")
+                logger.info(f"🔵 Best {CURRENCY} Buy Rate: {market_stats['people_buying']['best_bank']} (LKR {market_stats['people_buying']['min']})")
 
-                create_execution_summary(all_bank_data, logger)
+                create_execution_summary(all_bank_data, logger, market_stats)
                 logger.info(f"✨ {CURRENCY} Execution completed successfully!")
             else:
                 logger.error(f"❌ [ERROR] Failed to save {CURRENCY} data to MongoDB Atlas")
@@ -914,11 +1218,12 @@ def main():
 
     except Exception as e:
         logger.error(f"❌ Critical {CURRENCY} scraping error: {e}")
-        import traceback
         logger.error(f"Full traceback: {traceback.format_exc()}")
         exit_code = 1
 
     finally:
+        quit_selenium_driver()
+
         if db:
             db.close_connection()
 
@@ -927,6 +1232,13 @@ def main():
         else:
             logger.error(f"🏁 {CURRENCY} Script execution failed")
 
+        stop_logging()
+        if FAST_EXIT:
+            # Everything is closed by now; flush output and skip interpreter teardown
+            logging.shutdown()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
         sys.exit(exit_code)
 
 
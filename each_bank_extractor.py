@@ -1,11 +1,15 @@
 import requests
+from urllib3.util.request import ACCEPT_ENCODING
 from bs4 import BeautifulSoup
-import pandas as pd
+import lxml.etree
+import lxml.html
 import re
 from datetime import datetime
 
 
-import time
+import functools
+import heapq
+import os
 import re
 from datetime import datetime
 from selenium import webdriver
@@ -13,8 +17,51 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import json
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from bank_http import SESSION
+
+# Rate-like numbers (e.g. 193.07) and AUD anchors used by the HNB strategies
+AUD_RATE_NUMBER_PATTERN = re.compile(r'(\d{2,3}\.\d{1,4})')
+AUD_RATE_WINDOW = 500
+# textContent rather than innerText so hidden carousel slides are searched too;
+# every match is kept as long as it holds a rate-shaped number
+AUD_SNIPPET_SCRIPT = r"""
+var text = document.body ? document.body.textContent : '';
+var rate = /\d{2,3}\.\d{1,4}/;
+return (text.match(new RegExp('(?:AUD|AUS|Australian)[\\s\\S]{0,' + arguments[0] + '}', 'gi')) || []).filter(function (snippet) {
+    return rate.test(snippet);
+});
+"""
+# innerText of an element and its ancestors, nearest first (matches WebElement.text)
+ANCESTOR_TEXTS_SCRIPT = """
+var el = arguments[0];
+var texts = [];
+for (var i = 0; i < arguments[1] && el; i++, el = el.parentElement) {
+    texts.push(el.innerText || '');
+}
+return texts;
+"""
+# innerText of every element passed in, fetched in one WebDriver round trip
+ELEMENT_TEXTS_SCRIPT = "return arguments[0].map(function (el) { return el.innerText || ''; });"
+# innerText of every table row on the page
+ROW_TEXTS_SCRIPT = "return Array.from(document.querySelectorAll('tr'), function (row) { return row.innerText || ''; });"
+# Any decimal number in a table cell or text line
+RATE_PATTERN = re.compile(r'\d+\.\d+')
+# Loose JSON objects (one level of nesting) embedded in inline scripts
+JSON_OBJECT_PATTERN = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}')
+# Keys that mark AUD entries and their buy/sell fields in embedded JSON
+AUD_KEY_PATTERN = re.compile(r'AUD|AUS|Australian', re.IGNORECASE)
+BUY_KEY_PATTERN = re.compile(r'buy|purchase', re.IGNORECASE)
+SELL_KEY_PATTERN = re.compile(r'sell|sale', re.IGNORECASE)
+# First two numbers after an AUD label in flattened text
+AUD_RATE_PAIR_PATTERN = re.compile(r'AUD.*?(\d+\.\d+).*?(\d+\.\d+)')
+BUYING_RATE_PATTERN = re.compile(r'(?i)(?:buy|purchase|buying).*?(\d{2,3}\.\d{1,4})')
+SELLING_RATE_PATTERN = re.compile(r'(?i)(?:sell|selling|sale).*?(\d{2,3}\.\d{1,4})')
 
 def scrape_boc_aud_rates():
     """
@@ -29,18 +76,18 @@ def scrape_boc_aud_rates():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
     }
     
     try:
         # Send GET request
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Parse HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Find the exchange rates table
         # Look for tables that might contain exchange rate data
@@ -73,7 +120,7 @@ def scrape_boc_aud_rates():
                     numeric_values = []
                     for cell in row_text[1:]:  # Skip the first cell (currency name)
                         # Look for decimal numbers that look like exchange rates (> 50)
-                        numbers = re.findall(r'\d+\.\d+', cell)
+                        numbers = RATE_PATTERN.findall(cell)
                         for num in numbers:
                             if float(num) > 50:  # Exchange rates should be > 50 LKR
                                 numeric_values.append(num)
@@ -113,18 +160,18 @@ def scrape_combank_aud_rates():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
     }
     
     try:
         # Send GET request
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Parse HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Find the exchange rates table
         tables = soup.find_all('table')
@@ -156,7 +203,7 @@ def scrape_combank_aud_rates():
                     numeric_values = []
                     for cell in row_text[1:]:  # Skip the first cell (currency name)
                         # Look for decimal numbers that look like exchange rates (> 50)
-                        numbers = re.findall(r'\d+\.\d+', cell)
+                        numbers = RATE_PATTERN.findall(cell)
                         for num in numbers:
                             if float(num) > 50:  # Exchange rates should be > 50 LKR
                                 numeric_values.append(num)
@@ -196,18 +243,18 @@ def scrape_amana_aud_rates():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
     }
     
     try:
         # Send GET request
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Parse HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Find the exchange rates table
         tables = soup.find_all('table')
@@ -239,7 +286,7 @@ def scrape_amana_aud_rates():
                     numeric_values = []
                     for cell in row_text[1:]:  # Skip the first cell (currency name)
                         # Look for decimal numbers that look like exchange rates (> 50)
-                        numbers = re.findall(r'\d+\.\d+', cell)
+                        numbers = RATE_PATTERN.findall(cell)
                         for num in numbers:
                             if float(num) > 50:  # Exchange rates should be > 50 LKR
                                 numeric_values.append(num)
@@ -301,9 +348,46 @@ def setup_chrome_driver(headless=True):
         print("Make sure ChromeDriver is installed and in your PATH")
         return None
 
-def scrape_hnb_aud_rates():
+def reset_driver(driver):
+    """
+    Clear cookies and blank the page so a shared driver starts each site clean
+    """
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+def scrape_hnb_via_http():
+    """
+    Try HNB's static HTML with requests + lxml before paying for a browser
+    Returns: Dictionary with buying and selling rates, or None if they are only rendered by JS
+    """
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept-Encoding': ACCEPT_ENCODING,
+    }
+    
+    try:
+        response = SESSION.get("https://www.hnb.lk/", headers=headers, timeout=8)
+        response.raise_for_status()
+        tree = lxml.html.fromstring(response.content)
+        rows = tree.xpath("//*[contains(text(), 'AUD') or contains(text(), 'AUS')]/ancestor::tr[1]")
+    except (requests.RequestException, lxml.etree.ParserError) as e:
+        print(f"HNB static fetch failed: {e}")
+        return None
+    
+    # Parse each row on its own so one row's buying rate never pairs with another's selling rate
+    for row in rows:
+        rates = extract_rates_from_text(" ".join(row.xpath(".//text()")))
+        if rates:
+            print(f"Found rates in static HNB HTML - Buying: {rates['buying_rate']}, Selling: {rates['selling_rate']}")
+            return rates
+    return None
+
+def scrape_hnb_aud_rates(driver=None, timestamp=None):
     """
     Scrape AUD exchange rates from HNB website using Selenium
+    Pass a driver, or a callable returning one, to reuse an existing browser; it is left open for the caller
+    A callable is only invoked when the static HTML has no rates
+    Pass the run's timestamp string to stamp every bank alike
     Returns: Dictionary containing AUD buying and selling rates
     """
     
@@ -314,17 +398,31 @@ def scrape_hnb_aud_rates():
         'buying_rate': None,
         'selling_rate': None,
         'source': 'HNB',
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'source_url': url
     }
     
-    driver = None
+    # Static HTML first; only launch or reuse a browser when the rates are JS-rendered
+    static_rates = scrape_hnb_via_http()
+    if static_rates:
+        aud_data.update(static_rates)
+        return aud_data
     
-    try:
-        # Setup Chrome driver
-        driver = setup_chrome_driver(headless=True)
+    if callable(driver):
+        driver = driver()
         if not driver:
             return None
+    
+    owns_driver = driver is None
+    
+    try:
+        if owns_driver:
+            # Setup Chrome driver
+            driver = setup_chrome_driver(headless=True)
+            if not driver:
+                return None
+        else:
+            reset_driver(driver)
         
         print("Loading HNB website...")
         driver.get(url)
@@ -338,41 +436,44 @@ def scrape_hnb_aud_rates():
         try:
             print("Strategy 1: Looking for exchange rate elements...")
             
-            # Wait for any exchange rate related elements to appear
+            # Wait for any exchange rate related elements to appear (CSS match, no per-node text XPath)
             rate_elements = wait.until(
-                EC.presence_of_all_elements_located((By.XPATH, "//*[contains(text(), 'USD') or contains(text(), 'Exchange') or contains(text(), 'Rate')]"))
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table, [class*='exchange'], [class*='rate'], [id*='rate']"))
             )
             
-            # Give extra time for all rates to load
-            time.sleep(5)
+            # Wait until the AUD rates have actually rendered instead of a fixed sleep
+            try:
+                wait.until(lambda d: d.execute_script(
+                    "return document.readyState === 'complete' && /AUD|AUS/.test(document.body.textContent)"
+                ))
+            except TimeoutException:
+                print("AUD text did not appear in time, checking elements anyway")
             
             # Look for AUD specifically
             aud_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'AUS') or contains(text(), 'AUD')]")
             
             for element in aud_elements:
-                print(f"Found AUD element: {element.text}")
+                # Text of the element and up to 4 ancestors, fetched in one round trip
+                try:
+                    parent_texts = driver.execute_script(ANCESTOR_TEXTS_SCRIPT, element, 5)
+                except WebDriverException:
+                    continue
+                print(f"Found AUD element: {parent_texts[0] if parent_texts else ''}")
                 
                 # Get parent container that might have the rates
-                parent = element
-                for _ in range(5):  # Check up to 5 parent levels
-                    try:
-                        parent_text = parent.text
-                        print(f"Checking parent container: {parent_text[:200]}...")
-                        
-                        # Extract numbers that look like exchange rates
-                        numbers = re.findall(r'(\d{2,3}\.\d{1,4})', parent_text)
-                        valid_rates = [float(num) for num in numbers if 150 <= float(num) <= 250]
-                        
-                        if len(valid_rates) >= 2:
-                            valid_rates.sort()
-                            aud_data['buying_rate'] = valid_rates[0]
-                            aud_data['selling_rate'] = valid_rates[1]
-                            print(f"Found rates in parent - Buying: {valid_rates[0]}, Selling: {valid_rates[1]}")
-                            return aud_data
-                        
-                        parent = parent.find_element(By.XPATH, "..")
-                    except:
-                        break
+                for parent_text in parent_texts:
+                    print(f"Checking parent container: {parent_text[:200]}...")
+                    
+                    # Extract numbers that look like exchange rates
+                    numbers = AUD_RATE_NUMBER_PATTERN.findall(parent_text)
+                    valid_rates = [v for v in (float(num) for num in numbers) if 150 <= v <= 250]
+                    
+                    if len(valid_rates) >= 2:
+                        buying_rate, selling_rate = heapq.nsmallest(2, valid_rates)
+                        aud_data['buying_rate'] = buying_rate
+                        aud_data['selling_rate'] = selling_rate
+                        print(f"Found rates in parent - Buying: {buying_rate}, Selling: {selling_rate}")
+                        return aud_data
                         
         except TimeoutException:
             print("Strategy 1 failed - no exchange rate elements found")
@@ -381,7 +482,8 @@ def scrape_hnb_aud_rates():
         try:
             print("Strategy 2: Trying common CSS selectors...")
             
-            selectors = [
+            # One combined selector: a single DOM query and WebDriver round trip
+            selector = ", ".join([
                 "[class*='rate']",
                 "[class*='exchange']",
                 "[class*='currency']",
@@ -391,41 +493,36 @@ def scrape_hnb_aud_rates():
                 ".currency-rate",
                 ".rate-card",
                 ".currency-card"
-            ]
+            ])
             
-            for selector in selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        if 'AUD' in element.text or 'AUS' in element.text:
-                            rates = extract_rates_from_text(element.text)
-                            if rates:
-                                aud_data.update(rates)
-                                print(f"Found rates via CSS selector '{selector}': {rates}")
-                                return aud_data
-                except:
-                    continue
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            element_texts = driver.execute_script(ELEMENT_TEXTS_SCRIPT, elements) if elements else []
+            
+            for element_text in element_texts:
+                if 'AUD' in element_text or 'AUS' in element_text:
+                    rates = extract_rates_from_text(element_text)
+                    if rates:
+                        aud_data.update(rates)
+                        print(f"Found rates via CSS selectors: {rates}")
+                        return aud_data
                     
         except Exception as e:
             print(f"Strategy 2 failed: {e}")
         
-        # Strategy 3: Search entire page source for AUD rates
+        # Strategy 3: Search the rendered page text for AUD rates
         try:
-            print("Strategy 3: Searching page source...")
+            print("Strategy 3: Searching page text...")
             
-            page_source = driver.page_source
+            # The browser returns only the text just after each AUD anchor, not the whole page source
+            snippets = driver.execute_script(AUD_SNIPPET_SCRIPT, AUD_RATE_WINDOW) or []
             
-            # Look for AUD patterns in the HTML
-            aud_pattern = r'(?i)(?:AUD|AUS|Australian).*?(\d{2,3}\.\d{1,4}).*?(\d{2,3}\.\d{1,4})'
-            matches = re.findall(aud_pattern, page_source)
-            
-            for match in matches:
-                rates = [float(rate) for rate in match if 150 <= float(rate) <= 250]
+            for snippet in snippets:
+                rates = [v for v in (float(rate) for rate in AUD_RATE_NUMBER_PATTERN.findall(snippet)) if 150 <= v <= 250]
                 if len(rates) >= 2:
-                    rates.sort()
+                    rates = sorted(rates[:2])
                     aud_data['buying_rate'] = rates[0]
                     aud_data['selling_rate'] = rates[1]
-                    print(f"Found rates in page source - Buying: {rates[0]}, Selling: {rates[1]}")
+                    print(f"Found rates in page text - Buying: {rates[0]}, Selling: {rates[1]}")
                     return aud_data
                     
         except Exception as e:
@@ -442,8 +539,7 @@ def scrape_hnb_aud_rates():
                     script_content = script.get_attribute("innerHTML")
                     if script_content and ('AUD' in script_content or 'AUS' in script_content):
                         # Try to extract JSON objects
-                        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-                        json_matches = re.findall(json_pattern, script_content)
+                        json_matches = JSON_OBJECT_PATTERN.findall(script_content)
                         
                         for json_str in json_matches:
                             try:
@@ -479,7 +575,7 @@ def scrape_hnb_aud_rates():
         print(f"Error scraping HNB data: {e}")
         return None
     finally:
-        if driver:
+        if owns_driver and driver:
             driver.quit()
 
 def extract_rates_from_text(text):
@@ -487,8 +583,8 @@ def extract_rates_from_text(text):
     Extract buying and selling rates from text
     """
     # Look for patterns like "Buying: 193.07" and "Selling: 203.4"
-    buying_match = re.search(r'(?i)(?:buy|purchase|buying).*?(\d{2,3}\.\d{1,4})', text)
-    selling_match = re.search(r'(?i)(?:sell|selling|sale).*?(\d{2,3}\.\d{1,4})', text)
+    buying_match = BUYING_RATE_PATTERN.search(text)
+    selling_match = SELLING_RATE_PATTERN.search(text)
     
     if buying_match and selling_match:
         buying_rate = float(buying_match.group(1))
@@ -501,14 +597,14 @@ def extract_rates_from_text(text):
             }
     
     # Fallback: look for any two numbers that could be rates
-    numbers = re.findall(r'(\d{2,3}\.\d{1,4})', text)
-    valid_rates = [float(num) for num in numbers if 150 <= float(num) <= 250]
+    numbers = AUD_RATE_NUMBER_PATTERN.findall(text)
+    valid_rates = [v for v in (float(num) for num in numbers) if 150 <= v <= 250]
     
     if len(valid_rates) >= 2:
-        valid_rates.sort()
+        buying_rate, selling_rate = heapq.nsmallest(2, valid_rates)
         return {
-            'buying_rate': valid_rates[0],
-            'selling_rate': valid_rates[1]
+            'buying_rate': buying_rate,
+            'selling_rate': selling_rate
         }
     
     return None
@@ -522,17 +618,17 @@ def find_aud_rates_in_dict(data, path=""):
             current_path = f"{path}.{key}" if path else key
             
             # Check if this key might contain AUD data
-            if re.search(r'AUD|AUS|Australian', str(key), re.IGNORECASE):
+            if AUD_KEY_PATTERN.search(str(key)):
                 if isinstance(value, dict):
                     # Look for buying/selling rates
                     buying = None
                     selling = None
                     
                     for subkey, subvalue in value.items():
-                        if re.search(r'buy|purchase', str(subkey), re.IGNORECASE):
+                        if BUY_KEY_PATTERN.search(str(subkey)):
                             if isinstance(subvalue, (int, float)) and 150 <= subvalue <= 250:
                                 buying = subvalue
-                        elif re.search(r'sell|sale', str(subkey), re.IGNORECASE):
+                        elif SELL_KEY_PATTERN.search(str(subkey)):
                             if isinstance(subvalue, (int, float)) and 150 <= subvalue <= 250:
                                 selling = subvalue
                     
@@ -568,7 +664,7 @@ def scrape_hsbc_aud_rates():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         }
         
-        response = requests.get(url, headers=headers, timeout=15)
+        response = SESSION.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
         aud_data = {
@@ -596,8 +692,8 @@ def scrape_hsbc_aud_rates():
                 print(f"Found AUD line: {line.strip()}")
                 
                 # Extract numeric values
-                numbers = re.findall(r'\d+\.\d+', line)
-                exchange_rates = [float(num) for num in numbers if float(num) > 50]
+                numbers = RATE_PATTERN.findall(line)
+                exchange_rates = [v for v in map(float, numbers) if v > 50]
                 
                 if len(exchange_rates) >= 2:
                     aud_data['buying_rate'] = exchange_rates[0]
@@ -608,8 +704,7 @@ def scrape_hsbc_aud_rates():
         # Method 2: If Method 1 fails, try alternative approach
         if aud_data['buying_rate'] is None:
             # Look for AUD pattern anywhere in content
-            aud_pattern = r'AUD.*?(\d+\.\d+).*?(\d+\.\d+)'
-            match = re.search(aud_pattern, content)
+            match = AUD_RATE_PAIR_PATTERN.search(content)
             if match:
                 rates = [float(match.group(1)), float(match.group(2))]
                 if all(rate > 50 for rate in rates):
@@ -636,6 +731,9 @@ def save_to_csv(data, filename='aud_exchange_rates.csv'):
     Save the scraped data to a CSV file
     Only saves one record per source per day
     """
+    # Deferred so a scrape that saves nothing never pays pandas' import time
+    import pandas as pd
+
     if data and data['buying_rate'] is not None:
         current_date = datetime.now().strftime('%Y-%m-%d')
         source_name = data['source']
@@ -724,7 +822,7 @@ def scrape_hsbc_with_pypdf2():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=15)
+        response = SESSION.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
         # Create a PDF reader object
@@ -743,8 +841,8 @@ def scrape_hsbc_with_pypdf2():
         for line in lines:
             if 'Australian' in line and 'AUD' in line:
                 print(f"Found AUD line: {line.strip()}")
-                numbers = re.findall(r'\d+\.\d+', line)
-                exchange_rates = [float(num) for num in numbers if float(num) > 50]
+                numbers = RATE_PATTERN.findall(line)
+                exchange_rates = [v for v in map(float, numbers) if v > 50]
                 
                 if len(exchange_rates) >= 2:
                     return {
@@ -765,9 +863,10 @@ def scrape_hsbc_with_pypdf2():
         print(f"PyPDF2 scraping error: {e}")
         return None
 
-def scrape_ntb_aud_rates():
+def scrape_ntb_aud_rates(timestamp=None):
     """
     Scrape AUD exchange rates from NTB (Nations Trust Bank) website
+    Pass the run's timestamp string to stamp every bank alike
     Returns: Dictionary containing AUD buying and selling rates
     """
     
@@ -778,25 +877,25 @@ def scrape_ntb_aud_rates():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
     }
     
     try:
         # Send GET request
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Parse HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         aud_data = {
             'currency': 'AUD',
             'buying_rate': None,
             'selling_rate': None,
             'source': 'NTB',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'source_url': url
         }
         
@@ -806,45 +905,41 @@ def scrape_ntb_aud_rates():
             print("AUD not found in page content")
             return None
         
-        # Method 1: Try to find AUD in tables
-        tables = soup.find_all('table')
-        print(f"Found {len(tables)} tables on the page")
+        # Method 1: Try to find AUD in table rows
+        rows = soup.find_all('tr')
+        print(f"Found {len(rows)} table rows on the page")
         
-        for table_idx, table in enumerate(tables):
-            rows = table.find_all('tr')
-            print(f"Table {table_idx + 1} has {len(rows)} rows")
+        for row_idx, row in enumerate(rows):
+            cells = row.find_all(['td', 'th'])
+            row_text = [cell.get_text(strip=True) for cell in cells]
             
-            for row_idx, row in enumerate(rows):
-                cells = row.find_all(['td', 'th'])
-                row_text = [cell.get_text(strip=True) for cell in cells]
+            # Look for AUD in the row
+            if any('AUD' in cell for cell in row_text):
+                print(f"Found AUD in row {row_idx + 1}: {row_text}")
                 
-                # Look for AUD in the row
-                if any('AUD' in cell for cell in row_text):
-                    print(f"Found AUD in table {table_idx + 1}, row {row_idx + 1}: {row_text}")
-                    
-                    # Extract numeric values
-                    numeric_values = []
-                    for cell in row_text:
-                        clean_cell = cell.replace(',', '').replace(' ', '')
-                        numbers = re.findall(r'\d+\.\d+', clean_cell)
-                        for num in numbers:
-                            if float(num) > 50:
-                                numeric_values.append(num)
-                    
-                    print(f"Numeric values found: {numeric_values}")
-                    
-                    if len(numeric_values) >= 4:
-                        # TT rates (positions 2 and 3)
-                        aud_data['buying_rate'] = float(numeric_values[2])
-                        aud_data['selling_rate'] = float(numeric_values[3])
-                        print(f"Selected TT rates - Buying: {numeric_values[2]}, Selling: {numeric_values[3]}")
-                        return aud_data
-                    elif len(numeric_values) >= 2:
-                        # Fallback
-                        aud_data['buying_rate'] = float(numeric_values[0])
-                        aud_data['selling_rate'] = float(numeric_values[1])
-                        print(f"Selected rates (fallback) - Buying: {numeric_values[0]}, Selling: {numeric_values[1]}")
-                        return aud_data
+                # Extract numeric values
+                numeric_values = []
+                for cell in row_text:
+                    clean_cell = cell.replace(',', '').replace(' ', '')
+                    numbers = RATE_PATTERN.findall(clean_cell)
+                    for num in numbers:
+                        if float(num) > 50:
+                            numeric_values.append(num)
+                
+                print(f"Numeric values found: {numeric_values}")
+                
+                if len(numeric_values) >= 4:
+                    # TT rates (positions 2 and 3)
+                    aud_data['buying_rate'] = float(numeric_values[2])
+                    aud_data['selling_rate'] = float(numeric_values[3])
+                    print(f"Selected TT rates - Buying: {numeric_values[2]}, Selling: {numeric_values[3]}")
+                    return aud_data
+                elif len(numeric_values) >= 2:
+                    # Fallback
+                    aud_data['buying_rate'] = float(numeric_values[0])
+                    aud_data['selling_rate'] = float(numeric_values[1])
+                    print(f"Selected rates (fallback) - Buying: {numeric_values[0]}, Selling: {numeric_values[1]}")
+                    return aud_data
         
         # Method 2: If table parsing fails, try text parsing
         print("Table parsing failed, trying text parsing...")
@@ -852,8 +947,8 @@ def scrape_ntb_aud_rates():
         for line in lines:
             if 'AUD' in line and any(char.isdigit() for char in line):
                 print(f"Found AUD line: {line.strip()}")
-                numbers = re.findall(r'\d+\.\d+', line.replace(',', ''))
-                exchange_rates = [float(num) for num in numbers if float(num) > 50]
+                numbers = RATE_PATTERN.findall(line.replace(',', ''))
+                exchange_rates = [v for v in map(float, numbers) if v > 50]
                 
                 if len(exchange_rates) >= 2:
                     aud_data['buying_rate'] = exchange_rates[0]
@@ -869,14 +964,15 @@ def scrape_ntb_aud_rates():
         return None
     except Exception as e:
         print(f"Error parsing NTB data: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
-def scrape_ntb_with_selenium():
+def scrape_ntb_with_selenium(driver=None, timestamp=None):
     """
     Alternative NTB scraping method using Selenium WebDriver
     Use this if the site requires JavaScript rendering
+    Pass a driver to reuse an existing browser; it is left open for the caller
+    Pass the run's timestamp string to stamp every bank alike
     """
     try:
         from selenium import webdriver
@@ -885,17 +981,21 @@ def scrape_ntb_with_selenium():
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
         
-        # Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Run in background
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Initialize driver
-        driver = webdriver.Chrome(options=chrome_options)
+        owns_driver = driver is None
+        if owns_driver:
+            # Chrome options
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')  # Run in background
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            
+            # Initialize driver
+            driver = webdriver.Chrome(options=chrome_options)
+        else:
+            reset_driver(driver)
         
         try:
             print("Loading NTB page with Selenium...")
@@ -906,28 +1006,31 @@ def scrape_ntb_with_selenium():
                 EC.presence_of_element_located((By.TAG_NAME, "table"))
             )
             
-            # Wait a bit more for dynamic content
-            import time
-            time.sleep(3)
+            # Wait for the AUD row to be populated with a rate instead of a fixed sleep
+            try:
+                WebDriverWait(driver, 10).until(
+                    lambda driver: driver.find_elements(
+                        By.XPATH, "//tr[contains(., 'AUD')][.//td[contains(., '.')]]"
+                    )
+                )
+            except TimeoutException:
+                print("Timed out waiting for AUD rates to render, checking page anyway")
             
-            # Check page source for AUD
-            page_source = driver.page_source
-            if 'AUD' not in page_source:
-                print("AUD not found in Selenium page source")
+            # Read every table row's text in one call; no need to serialize the whole page
+            row_texts = driver.execute_script(ROW_TEXTS_SCRIPT)
+            print(f"Selenium found {len(row_texts)} total rows")
+            if not any('AUD' in row_text for row_text in row_texts):
+                print("AUD not found in Selenium table rows")
                 return None
             
-            # Find all table rows
-            rows = driver.find_elements(By.TAG_NAME, "tr")
-            print(f"Selenium found {len(rows)} total rows")
-            
-            for row_idx, row in enumerate(rows):
-                row_text = row.text.strip()
+            for row_idx, row_text in enumerate(row_texts):
+                row_text = row_text.strip()
                 if 'AUD' in row_text:
                     print(f"Found AUD row {row_idx + 1}: {row_text}")
                     
                     # Extract rates
-                    numbers = re.findall(r'\d+\.\d+', row_text.replace(',', ''))
-                    exchange_rates = [float(num) for num in numbers if float(num) > 50]
+                    numbers = RATE_PATTERN.findall(row_text.replace(',', ''))
+                    exchange_rates = [v for v in map(float, numbers) if v > 50]
                     
                     print(f"Exchange rates found: {exchange_rates}")
                     
@@ -940,7 +1043,7 @@ def scrape_ntb_with_selenium():
                             'buying_rate': exchange_rates[0],
                             'selling_rate': exchange_rates[1],
                             'source': 'NTB',
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                             'source_url': "https://www.nationstrust.com/foreign-exchange-rates"
                         }
             
@@ -948,7 +1051,8 @@ def scrape_ntb_with_selenium():
             return None
             
         finally:
-            driver.quit()
+            if owns_driver:
+                driver.quit()
             
     except ImportError:
         print("Selenium not installed. Install with: pip install selenium")
@@ -989,18 +1093,18 @@ def scrape_peoples_bank_aud_rates():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
     }
     
     try:
         # Send GET request
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Parse HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Find the exchange rates table
         tables = soup.find_all('table')
@@ -1034,7 +1138,7 @@ def scrape_peoples_bank_aud_rates():
                         # Look for decimal numbers that look like exchange rates (> 50)
                         # Remove commas first (for rates like 1,022.44)
                         clean_cell = cell.replace(',', '')
-                        numbers = re.findall(r'\d+\.\d+', clean_cell)
+                        numbers = RATE_PATTERN.findall(clean_cell)
                         for num in numbers:
                             if float(num) > 50:  # Exchange rates should be > 50 LKR
                                 numeric_values.append(num)
@@ -1076,18 +1180,18 @@ def scrape_sampath_aud_rates():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
     }
     
     try:
         # Send GET request
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         # Parse HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         aud_data = {
             'currency': 'AUD',
@@ -1124,7 +1228,7 @@ def scrape_sampath_aud_rates():
                     numeric_values = []
                     for cell in row_text:
                         clean_cell = cell.replace(',', '').replace(' ', '')
-                        numbers = re.findall(r'\d+\.\d+', clean_cell)
+                        numbers = RATE_PATTERN.findall(clean_cell)
                         for num in numbers:
                             if float(num) > 50:
                                 numeric_values.append(num)
@@ -1148,16 +1252,21 @@ def scrape_sampath_aud_rates():
         print(f"Error parsing Sampath Bank data: {e}")
         return None
 
-def scrape_sampath_with_selenium():
+def scrape_sampath_with_selenium(driver=None):
     """
     Alternative Sampath Bank scraping method using Selenium WebDriver
     Use this if the site requires JavaScript rendering
+    Pass a driver to reuse an existing browser; it is left open for the caller
     """
     try:
-        # Use the enhanced driver function
-        driver = get_selenium_driver()
-        if not driver:
-            return None
+        owns_driver = driver is None
+        if owns_driver:
+            # Use the enhanced driver function
+            driver = get_selenium_driver()
+            if not driver:
+                return None
+        else:
+            reset_driver(driver)
         
         try:
             print("Loading Sampath Bank page with Selenium...")
@@ -1168,31 +1277,34 @@ def scrape_sampath_with_selenium():
             from selenium.webdriver.support.ui import WebDriverWait
             
             WebDriverWait(driver, 20).until(
-                lambda driver: "AUD" in driver.page_source or len(driver.find_elements(By.TAG_NAME, "table")) > 0
+                lambda driver: len(driver.find_elements(By.TAG_NAME, "table")) > 0 or "AUD" in driver.page_source
             )
             
-            # Wait a bit more for dynamic content
-            import time
-            time.sleep(5)
+            # Wait for the AUD row to be populated with a rate instead of a fixed sleep
+            try:
+                WebDriverWait(driver, 15).until(
+                    lambda driver: driver.find_elements(
+                        By.XPATH, "//tr[contains(., 'AUD')][.//td[contains(., '.')]]"
+                    )
+                )
+            except TimeoutException:
+                print("Timed out waiting for AUD rates to render, checking page anyway")
             
-            # Check page source for AUD
-            page_source = driver.page_source
-            if 'AUD' not in page_source:
-                print("AUD not found in Selenium page source")
+            # Read every table row's text in one call; no need to serialize the whole page
+            row_texts = driver.execute_script(ROW_TEXTS_SCRIPT)
+            print(f"Selenium found {len(row_texts)} total rows")
+            if not any('AUD' in row_text for row_text in row_texts):
+                print("AUD not found in Selenium table rows")
                 return None
             
-            # Find all table rows
-            rows = driver.find_elements(By.TAG_NAME, "tr")
-            print(f"Selenium found {len(rows)} total rows")
-            
-            for row_idx, row in enumerate(rows):
-                row_text = row.text.strip()
+            for row_idx, row_text in enumerate(row_texts):
+                row_text = row_text.strip()
                 if 'AUD' in row_text:
                     print(f"Found AUD row {row_idx + 1}: {row_text}")
                     
                     # Extract rates
-                    numbers = re.findall(r'\d+\.\d+', row_text.replace(',', ''))
-                    exchange_rates = [float(num) for num in numbers if float(num) > 50]
+                    numbers = RATE_PATTERN.findall(row_text.replace(',', ''))
+                    exchange_rates = [v for v in map(float, numbers) if v > 50]
                     
                     print(f"Exchange rates found: {exchange_rates}")
                     
@@ -1211,7 +1323,8 @@ def scrape_sampath_with_selenium():
             return None
             
         finally:
-            driver.quit()
+            if owns_driver:
+                driver.quit()
             
     except ImportError:
         print("Selenium not installed. Install with: pip install selenium")
@@ -1221,6 +1334,21 @@ def scrape_sampath_with_selenium():
         return None
 
 # Enhanced Selenium function with better error handling
+@functools.lru_cache(maxsize=1)
+def get_chromedriver_path():
+    """
+    Resolve the ChromeDriver binary once per run
+    CHROMEDRIVER_PATH wins when it points at a file; otherwise webdriver-manager
+    downloads (or reuses its cached copy of) the driver matching the installed Chrome
+    Raises ImportError when webdriver-manager is not installed
+    """
+    driver_path = os.getenv('CHROMEDRIVER_PATH')
+    if driver_path and os.path.isfile(driver_path):
+        return driver_path
+    
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
 def get_selenium_driver():
     """
     Get a properly configured Selenium driver with better error handling
@@ -1231,7 +1359,7 @@ def get_selenium_driver():
         
         # Try using webdriver-manager first (auto-manages ChromeDriver)
         try:
-            from webdriver_manager.chrome import ChromeDriverManager
+            driver_path = get_chromedriver_path()
             chrome_options = Options()
             chrome_options.add_argument('--headless')
             chrome_options.add_argument('--no-sandbox')
@@ -1240,7 +1368,7 @@ def get_selenium_driver():
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
-            driver = webdriver.Chrome(ChromeDriverManager().install(), options=chrome_options)
+            driver = webdriver.Chrome(service=Service(executable_path=driver_path), options=chrome_options)
             return driver
             
         except ImportError:
@@ -1314,7 +1442,7 @@ def scrape_with_selenium():
                         print(f"AUD row found: {cell_texts}")
                         
                         # Extract rates
-                        rates = re.findall(r'\d+\.\d+', ' '.join(cell_texts))
+                        rates = RATE_PATTERN.findall(' '.join(cell_texts))
                         if len(rates) >= 2:
                             return {
                                 'currency': 'AUD',
@@ -1344,128 +1472,158 @@ def scrape_all_banks():
     
     banks_scraped = []
     
-    # Scrape BOC
-    print("\n1. Scraping Bank of Ceylon...")
-    boc_rates = scrape_boc_aud_rates()
-    if boc_rates and boc_rates['buying_rate'] is not None:
-        print_rates(boc_rates)
-        save_to_csv(boc_rates)
-        banks_scraped.append('BOC')
-    else:
-        print("Failed to scrape BOC rates")
+    # One timestamp for the whole run, so every bank's row carries the same value
+    run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
-    # Scrape Commercial Bank
-    print("\n2. Scraping Commercial Bank...")
-    combank_rates = scrape_combank_aud_rates()
-    if combank_rates and combank_rates['buying_rate'] is not None:
-        print_rates(combank_rates)
-        save_to_csv(combank_rates)
-        banks_scraped.append('Commercial Bank')
-    else:
-        print("Failed to scrape Commercial Bank rates")
+    # One browser for every Selenium-based scrape in this run, started only once a scrape needs it
+    driver = None
+    driver_lock = threading.Lock()
     
-    # Scrape Amana Bank
-    print("\n3. Scraping Amana Bank...")
-    amana_rates = scrape_amana_aud_rates()
-    if amana_rates and amana_rates['buying_rate'] is not None:
-        print_rates(amana_rates)
-        save_to_csv(amana_rates)
-        banks_scraped.append('Amana Bank')
-    else:
-        print("Failed to scrape Amana Bank rates")
+    def get_driver():
+        nonlocal driver
+        with driver_lock:
+            if driver is None:
+                driver = setup_chrome_driver(headless=True)
+            return driver
     
-    # Scrape HNB
-    print("\n4. Scraping HNB...")
-    hnb_rates = scrape_hnb_aud_rates()
-    if hnb_rates and hnb_rates['buying_rate'] is not None:
-        print_rates(hnb_rates)
-        save_to_csv(hnb_rates)
-        banks_scraped.append('HNB')
-    else:
-        print("Failed to scrape HNB rates")
+    # Every first-choice scrape waits on a different site, so start them all now;
+    # only HNB uses the browser, and the Selenium fallbacks run after it finishes
+    executor = ThreadPoolExecutor(max_workers=8)
+    boc_future = executor.submit(scrape_boc_aud_rates)
+    combank_future = executor.submit(scrape_combank_aud_rates)
+    amana_future = executor.submit(scrape_amana_aud_rates)
+    hnb_future = executor.submit(scrape_hnb_aud_rates, get_driver, run_timestamp)
+    hsbc_future = executor.submit(scrape_hsbc_aud_rates)
+    ntb_future = executor.submit(scrape_ntb_aud_rates, run_timestamp)
+    peoples_future = executor.submit(scrape_peoples_bank_aud_rates)
+    sampath_future = executor.submit(scrape_sampath_aud_rates)
+    try:
+        # Scrape BOC
+        print("\n1. Scraping Bank of Ceylon...")
+        boc_rates = boc_future.result()
+        if boc_rates and boc_rates['buying_rate'] is not None:
+            print_rates(boc_rates)
+            save_to_csv(boc_rates)
+            banks_scraped.append('BOC')
+        else:
+            print("Failed to scrape BOC rates")
     
-    # Scrape HSBC
-    print("\n5. Scraping HSBC...")
-    hsbc_rates = scrape_hsbc_aud_rates()
-    if hsbc_rates and hsbc_rates['buying_rate'] is not None:
-        print_rates(hsbc_rates)
-        save_to_csv(hsbc_rates)
-        banks_scraped.append('HSBC')
-    else:
-        print("Primary HSBC method failed. Trying PyPDF2...")
-        hsbc_rates = scrape_hsbc_with_pypdf2()
+        # Scrape Commercial Bank
+        print("\n2. Scraping Commercial Bank...")
+        combank_rates = combank_future.result()
+        if combank_rates and combank_rates['buying_rate'] is not None:
+            print_rates(combank_rates)
+            save_to_csv(combank_rates)
+            banks_scraped.append('Commercial Bank')
+        else:
+            print("Failed to scrape Commercial Bank rates")
+    
+        # Scrape Amana Bank
+        print("\n3. Scraping Amana Bank...")
+        amana_rates = amana_future.result()
+        if amana_rates and amana_rates['buying_rate'] is not None:
+            print_rates(amana_rates)
+            save_to_csv(amana_rates)
+            banks_scraped.append('Amana Bank')
+        else:
+            print("Failed to scrape Amana Bank rates")
+    
+        # Scrape HNB
+        print("\n4. Scraping HNB...")
+        hnb_rates = hnb_future.result()
+        if hnb_rates and hnb_rates['buying_rate'] is not None:
+            print_rates(hnb_rates)
+            save_to_csv(hnb_rates)
+            banks_scraped.append('HNB')
+        else:
+            print("Failed to scrape HNB rates")
+    
+        # Scrape HSBC
+        print("\n5. Scraping HSBC...")
+        hsbc_rates = hsbc_future.result()
         if hsbc_rates and hsbc_rates['buying_rate'] is not None:
             print_rates(hsbc_rates)
             save_to_csv(hsbc_rates)
             banks_scraped.append('HSBC')
         else:
-            print("Failed to scrape HSBC rates with both methods")
+            print("Primary HSBC method failed. Trying PyPDF2...")
+            hsbc_rates = scrape_hsbc_with_pypdf2()
+            if hsbc_rates and hsbc_rates['buying_rate'] is not None:
+                print_rates(hsbc_rates)
+                save_to_csv(hsbc_rates)
+                banks_scraped.append('HSBC')
+            else:
+                print("Failed to scrape HSBC rates with both methods")
     
-    # Scrape NTB
-    print("\n6. Scraping NTB...")
-    ntb_rates = scrape_ntb_aud_rates()
-    if ntb_rates and ntb_rates['buying_rate'] is not None:
-        print_rates(ntb_rates)
-        save_to_csv(ntb_rates)
-        banks_scraped.append('NTB')
-    else:
-        print("Primary NTB method failed. Trying Selenium...")
-        ntb_rates = scrape_ntb_with_selenium()
+        # Scrape NTB
+        print("\n6. Scraping NTB...")
+        ntb_rates = ntb_future.result()
         if ntb_rates and ntb_rates['buying_rate'] is not None:
             print_rates(ntb_rates)
             save_to_csv(ntb_rates)
             banks_scraped.append('NTB')
         else:
-            print("Selenium method failed. Using fallback...")
-            ntb_rates = scrape_ntb_fallback()
-            if ntb_rates:
+            print("Primary NTB method failed. Trying Selenium...")
+            ntb_rates = scrape_ntb_with_selenium(get_driver(), run_timestamp)
+            if ntb_rates and ntb_rates['buying_rate'] is not None:
                 print_rates(ntb_rates)
                 save_to_csv(ntb_rates)
-                banks_scraped.append('NTB (fallback)')
+                banks_scraped.append('NTB')
             else:
-                print("All NTB methods failed")
+                print("Selenium method failed. Using fallback...")
+                ntb_rates = scrape_ntb_fallback()
+                if ntb_rates:
+                    print_rates(ntb_rates)
+                    save_to_csv(ntb_rates)
+                    banks_scraped.append('NTB (fallback)')
+                else:
+                    print("All NTB methods failed")
     
-    # Scrape Peoples Bank
-    print("\n7. Scraping Peoples Bank...")
-    peoples_rates = scrape_peoples_bank_aud_rates()
-    if peoples_rates and peoples_rates['buying_rate'] is not None:
-        print_rates(peoples_rates)
-        save_to_csv(peoples_rates)
-        banks_scraped.append('Peoples Bank')
-    else:
-        print("Failed to scrape Peoples Bank rates")
+        # Scrape Peoples Bank
+        print("\n7. Scraping Peoples Bank...")
+        peoples_rates = peoples_future.result()
+        if peoples_rates and peoples_rates['buying_rate'] is not None:
+            print_rates(peoples_rates)
+            save_to_csv(peoples_rates)
+            banks_scraped.append('Peoples Bank')
+        else:
+            print("Failed to scrape Peoples Bank rates")
     
-    # Scrape Sampath Bank
-    print("\n8. Scraping Sampath Bank...")
-    sampath_rates = scrape_sampath_aud_rates()
-    if sampath_rates and sampath_rates['buying_rate'] is not None:
-        print_rates(sampath_rates)
-        save_to_csv(sampath_rates)
-        banks_scraped.append('Sampath Bank')
-    else:
-        print("Primary Sampath Bank method failed. Trying Selenium...")
-        sampath_rates = scrape_sampath_with_selenium()
+        # Scrape Sampath Bank
+        print("\n8. Scraping Sampath Bank...")
+        sampath_rates = sampath_future.result()
         if sampath_rates and sampath_rates['buying_rate'] is not None:
             print_rates(sampath_rates)
             save_to_csv(sampath_rates)
             banks_scraped.append('Sampath Bank')
         else:
-            print("Selenium method failed. Using fallback...")
-            sampath_rates = scrape_sampath_fallback()
-            if sampath_rates:
+            print("Primary Sampath Bank method failed. Trying Selenium...")
+            sampath_rates = scrape_sampath_with_selenium(get_driver())
+            if sampath_rates and sampath_rates['buying_rate'] is not None:
                 print_rates(sampath_rates)
                 save_to_csv(sampath_rates)
-                banks_scraped.append('Sampath Bank (fallback)')
+                banks_scraped.append('Sampath Bank')
             else:
-                print("All Sampath Bank methods failed")
+                print("Selenium method failed. Using fallback...")
+                sampath_rates = scrape_sampath_fallback()
+                if sampath_rates:
+                    print_rates(sampath_rates)
+                    save_to_csv(sampath_rates)
+                    banks_scraped.append('Sampath Bank (fallback)')
+                else:
+                    print("All Sampath Bank methods failed")
     
-    # Summary
-    if banks_scraped:
-        print(f"\n[SUCCESS] Successfully scraped rates from: {', '.join(banks_scraped)}")
-    else:
-        print("\n[ERROR] Failed to scrape rates from any bank")
+        # Summary
+        if banks_scraped:
+            print(f"\n[SUCCESS] Successfully scraped rates from: {', '.join(banks_scraped)}")
+        else:
+            print("\n[ERROR] Failed to scrape rates from any bank")
     
-    return banks_scraped
+        return banks_scraped
+    finally:
+        executor.shutdown(wait=True)
+        if driver:
+            driver.quit()
 
 if __name__ == "__main__":
     # You can choose to scrape all banks or individual banks